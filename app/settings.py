@@ -35,6 +35,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestTimestampMiddleware',
+    # Compresses JSON bodies (>= 200 bytes) for clients that accept gzip
+    'django.middleware.gzip.GZipMiddleware',
     'core.middleware.SecurityHeadersMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -75,7 +78,12 @@ DATABASES = {
         'USER': os.getenv('DB_USER'),
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
-        'PORT': os.getenv('DB_PORT', 5432)
+        'PORT': os.getenv('DB_PORT', 5432),
+        # Reuse connections across requests instead of reconnecting each time
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        # Required behind PgBouncer in transaction pooling mode
+        'DISABLE_SERVER_SIDE_CURSORS': os.getenv('DB_USE_PGBOUNCER', 'False').lower() == 'true',
     }
 }
 
@@ -120,8 +128,12 @@ MEDIA_URL = '/media/'
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'core.authentication.ProfileJWTAuthentication',
     ),
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
 
 # Caching Configuration
@@ -148,3 +160,8 @@ CORS_ALLOWED_ORIGINS = [
 # DALL-E API Configuration
 DALLE_API_KEY = os.getenv("DALLE_API_KEY", "")
 IMAGE_STORAGE_PATH = BASE_DIR / "unipost_automation/src/images"
+
+# Memory-mapped vector matrices for knowledge base similarity search
+EMBEDDING_MATRIX_DIR = Path(
+    os.getenv("EMBEDDING_MATRIX_DIR", BASE_DIR / "embedding_matrices")
+)
@@ -73,6 +73,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestTimestampMiddleware',
+    # Compresses JSON bodies (>= 200 bytes) for clients that accept gzip
+    'django.middleware.gzip.GZipMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -118,7 +121,10 @@ DATABASES = {
             'sslmode': 'require' if not DEBUG else 'disable',
             'connect_timeout': 10,
         },
-        'CONN_MAX_AGE': 600,  # Connection pooling
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 600)),  # Connection pooling
+        'CONN_HEALTH_CHECKS': True,
+        # Required behind PgBouncer in transaction pooling mode
+        'DISABLE_SERVER_SIDE_CURSORS': os.getenv('DB_USE_PGBOUNCER', 'False').lower() == 'true',
     }
 }
 
@@ -202,7 +208,7 @@ SIMPLE_JWT = {
 # Enhanced REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'core.authentication.ProfileJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -226,7 +232,7 @@ REST_FRAMEWORK = {
     'ALLOWED_VERSIONS': ['v1', 'v2'],
     'DEFAULT_VERSION': 'v1',
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'core.renderers.ORJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
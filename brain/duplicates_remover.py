@@ -69,9 +69,11 @@ class DuplicatesRemover:
     def remove_duplicates_for_title(self, title: str):
         """Remove duplicatas para um título específico,
         mantendo apenas o mais antigo"""
+        # Só id e data são usados; não carrega vetor nem metadados
         embeddings = (
             Embedding.objects
             .filter(origin='business_brain', title=title)
+            .only('id', 'created_at')
             .order_by('created_at')
         )
 
@@ -186,7 +188,7 @@ class DuplicatesRemover:
             embeddings = Embedding.objects.filter(
                 origin='business_brain',
                 title=title
-            ).order_by('created_at')
+            ).only('id', 'created_at').order_by('created_at')
 
             first = embeddings.first()
             to_remove = count - 1
@@ -4,4 +4,8 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
-    verbose_name = 'Core System'
\ No newline at end of file
+    verbose_name = 'Core System'
+
+    def ready(self):
+        """Register signal handlers"""
+        import core.signals  # noqa: F401
@@ -0,0 +1,235 @@
+"""
+Background writer for API audit logs
+
+The middleware only snapshots the request/response into a small payload and
+hands it to ``record_audit``. Enrichment (header filtering, body parsing, risk
+scoring) and the database INSERT happen on a daemon worker thread, off the
+request path. The worker collects up to BATCH_SIZE payloads, or whatever
+arrived within BATCH_INTERVAL seconds, and writes them with one bulk_create.
+Payloads still queued when the process exits are flushed by an atexit hook.
+"""
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import close_old_connections
+
+from .models import APIAuditLog
+
+# Loggers
+audit_logger = logging.getLogger('core.audit')
+security_logger = logging.getLogger('django.security')
+
+SENSITIVE_HEADERS = frozenset(['authorization', 'cookie', 'x-api-key', 'x-auth-token'])
+SUSPICIOUS_AGENTS = ('bot', 'crawler', 'spider', 'scan', 'curl', 'wget')
+SUSPICIOUS_PATHS = ('/admin', '/.env', '/config', '/wp-admin', '/phpmyadmin')
+SENSITIVE_ENDPOINTS = ('/api/', '/admin/')
+
+BATCH_SIZE = 500
+BATCH_INTERVAL = 1.0  # seconds
+
+_audit_queue = queue.SimpleQueue()
+_worker = None
+_worker_lock = threading.Lock()
+_flush_registered = False
+
+
+def record_audit(payload):
+    """Queue an audit payload for the background writer"""
+    _ensure_worker()
+    _audit_queue.put(payload)
+
+
+def _ensure_worker():
+    """Start the writer thread on first use"""
+    global _worker, _flush_registered
+    if _worker is not None and _worker.is_alive():
+        return
+
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(
+                target=_run_worker,
+                name='api-audit-writer',
+                daemon=True
+            )
+            _worker.start()
+            # Only once, however many times the thread has to be restarted
+            if not _flush_registered:
+                atexit.register(_flush_pending)
+                _flush_registered = True
+
+
+def _run_worker():
+    while True:
+        batch = _next_batch()
+        close_old_connections()
+        try:
+            write_audit_logs(batch)
+        except Exception as e:
+            # Log to file if DB fails
+            audit_logger.error(f"Failed to create {len(batch)} audit log(s): {e}")
+
+
+def _next_batch():
+    """Wait for a payload, then collect more until the batch is full or due"""
+    batch = [_audit_queue.get()]
+    deadline = time.monotonic() + BATCH_INTERVAL
+
+    while len(batch) < BATCH_SIZE:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(_audit_queue.get(timeout=remaining))
+        except queue.Empty:
+            break
+
+    return batch
+
+
+def _flush_pending():
+    """Write whatever is still queued, e.g. when a worker process restarts"""
+    batch = []
+    while True:
+        try:
+            batch.append(_audit_queue.get_nowait())
+        except queue.Empty:
+            break
+
+    for start in range(0, len(batch), BATCH_SIZE):
+        try:
+            write_audit_logs(batch[start:start + BATCH_SIZE])
+        except Exception as e:
+            audit_logger.error(f"Failed to flush {len(batch) - start} audit log(s) at exit: {e}")
+            return
+
+
+def write_audit_logs(payloads):
+    """Enrich audit payloads and persist them in one INSERT"""
+    # ON CONFLICT DO NOTHING: a duplicate row must not drop the whole batch
+    APIAuditLog.objects.bulk_create(
+        [build_audit_log(payload) for payload in payloads],
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=True
+    )
+
+
+def build_audit_log(payload):
+    """Build an unsaved APIAuditLog from an audit payload"""
+    meta = payload['meta']
+
+    risk_score = calculate_risk_score(payload)
+    is_suspicious = risk_score > 70
+
+    # Log suspicious activity
+    if is_suspicious:
+        security_logger.warning(f"Suspicious activity detected: {payload['method']} {payload['path']} from {payload['ip_address']} (Risk Score: {risk_score})")
+
+    return APIAuditLog(
+        user_id=payload['user_id'],
+        session_id=payload['session_id'],
+        method=payload['method'],
+        endpoint=payload['path'],
+        full_url=build_full_url(payload),
+        ip_address=payload['ip_address'],
+        user_agent=meta.get('HTTP_USER_AGENT', '')[:500],
+        referer=meta.get('HTTP_REFERER'),
+        request_headers=get_safe_headers(meta),
+        request_body=parse_request_body(payload['body'], payload['content_type']),
+        response_status=payload['status'],
+        response_size=payload['size'],
+        response_time_ms=payload['response_time'],
+        db_queries_count=payload['db_queries'],
+        db_time_ms=payload['db_time'],
+        is_suspicious=is_suspicious,
+        risk_score=risk_score,
+        api_version=payload['api_version'],
+        additional_data={
+            'request_id': payload['request_id'],
+            'content_type': payload['content_type'],
+        }
+    )
+
+
+def build_full_url(payload):
+    """
+    Rebuild the absolute request URL from its parts
+
+    Avoids request.build_absolute_uri() on the request thread, which
+    re-validates the host against ALLOWED_HOSTS on every call.
+    """
+    return f"{payload['scheme']}://{payload['host']}{payload['full_path']}"
+
+
+def parse_request_body(body, content_type):
+    """Summarize the raw request body for storage"""
+    if not body:
+        return None
+
+    try:
+        if content_type == 'application/json':
+            return json.loads(body.decode('utf-8'))
+        return {'content_type': content_type, 'size': len(body)}
+    except Exception:
+        return {'error': 'Could not parse request body'}
+
+
+def get_safe_headers(meta):
+    """Get safe headers (without sensitive information)"""
+    safe_headers = {}
+
+    for key, value in meta.items():
+        header_name = key[5:].lower().replace('_', '-')
+        if header_name not in SENSITIVE_HEADERS:
+            safe_headers[header_name] = value[:200]  # Limit length
+        else:
+            safe_headers[header_name] = '[REDACTED]'
+
+    return safe_headers
+
+
+def calculate_risk_score(payload):
+    """Calculate risk score based on various factors"""
+    risk_score = 0
+    status_code = payload['status']
+
+    # High status codes
+    if status_code >= 400:
+        risk_score += 20
+    if status_code == 404:
+        risk_score += 10
+    if status_code == 403:
+        risk_score += 30
+
+    # Suspicious user agents
+    user_agent = payload['meta'].get('HTTP_USER_AGENT', '').lower()
+    if any(agent in user_agent for agent in SUSPICIOUS_AGENTS):
+        risk_score += 25
+
+    # Unusual paths
+    path = payload['path'].lower()
+    if any(sus_path in path for sus_path in SUSPICIOUS_PATHS):
+        risk_score += 40
+
+    # High request frequency from same IP
+    cache_key = f"request_count_{payload['ip_address']}"
+    try:
+        request_count = cache.incr(cache_key)
+    except ValueError:
+        # First request in the window
+        cache.add(cache_key, 1, 60)  # 1 minute window
+        request_count = 1
+    if request_count > 100:  # More than 100 requests per minute
+        risk_score += 30
+
+    # Anonymous user accessing sensitive endpoints
+    if payload['user_id'] is None:
+        if any(endpoint in path for endpoint in SENSITIVE_ENDPOINTS):
+            risk_score += 15
+
+    return min(risk_score, 100)  # Cap at 100
@@ -0,0 +1,50 @@
+"""
+Blocked client IPs
+
+Blocks live in the shared cache under ``blocked_ip_<ip>``. Each process
+remembers the answer for an IP, including "not blocked", in a small TTL cache
+so the per-request permission check rarely goes to the shared cache. Blocks
+made by another process become visible within LOCAL_TTL seconds.
+"""
+import threading
+
+from cachetools import TTLCache
+from django.core.cache import cache
+
+LOCAL_TTL = 60  # seconds
+LOCAL_MAXSIZE = 10_000
+
+_local = TTLCache(maxsize=LOCAL_MAXSIZE, ttl=LOCAL_TTL)
+_lock = threading.Lock()  # TTLCache isn't thread-safe
+
+
+def _blocked_key(ip):
+    return f"blocked_ip_{ip}"
+
+
+def is_ip_blocked(ip):
+    """Check whether the IP is blocked"""
+    with _lock:
+        try:
+            return _local[ip]
+        except KeyError:
+            pass
+
+    blocked = bool(cache.get(_blocked_key(ip)))
+    with _lock:
+        _local[ip] = blocked
+    return blocked
+
+
+def block_ip(ip, timeout=3600):
+    """Block the IP for ``timeout`` seconds"""
+    cache.set(_blocked_key(ip), True, timeout)
+    with _lock:
+        _local[ip] = True
+
+
+def unblock_ip(ip):
+    """Lift a block on the IP"""
+    cache.delete(_blocked_key(ip))
+    with _lock:
+        _local.pop(ip, None)
@@ -0,0 +1,41 @@
+"""
+Django command to pre-create monthly APIAuditLog partitions
+
+Rows already logged for a month that had no partition sit in the DEFAULT
+partition; creating the month moves them into it first.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = 'Creates the monthly APIAuditLog partitions ahead of time (run from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months',
+            type=int,
+            default=3,
+            help='Number of months to create, starting with the current one',
+        )
+
+    def handle(self, *args, **options):
+        months = options.get('months', 3)
+        today = timezone.now().date().replace(day=1)
+
+        with connection.cursor() as cursor:
+            for offset in range(months):
+                year = today.year + (today.month - 1 + offset) // 12
+                month = (today.month - 1 + offset) % 12 + 1
+                cursor.execute(
+                    "SELECT core_create_apiauditlog_partition(%s)",
+                    [today.replace(year=year, month=month)]
+                )
+                partition_name = cursor.fetchone()[0]
+                self.stdout.write(f"Partition '{partition_name}' is ready")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{months} audit log partition(s) ensured")
+        )
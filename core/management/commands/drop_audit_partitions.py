@@ -0,0 +1,75 @@
+"""
+Django command to drop APIAuditLog partitions past the retention period
+"""
+
+import re
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+PARTITION_NAME_RE = re.compile(r'^core_apiauditlog_y(\d{4})m(\d{2})$')
+
+
+class Command(BaseCommand):
+    help = 'Detaches and drops monthly APIAuditLog partitions older than the retention period (run nightly)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep-months',
+            type=int,
+            default=12,
+            help='Number of months to keep, including the current one',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only list the partitions that would be dropped',
+        )
+
+    def handle(self, *args, **options):
+        keep_months = max(options.get('keep_months', 12), 1)
+        dry_run = options.get('dry_run', False)
+
+        today = timezone.now().date()
+        # (year, month) of the oldest month to keep
+        oldest = divmod(today.year * 12 + today.month - 1 - (keep_months - 1), 12)
+        oldest = (oldest[0], oldest[1] + 1)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE parent.relname = 'core_apiauditlog'
+                ORDER BY child.relname
+                """
+            )
+            partitions = [row[0] for row in cursor.fetchall()]
+
+            dropped = 0
+            for partition_name in partitions:
+                match = PARTITION_NAME_RE.match(partition_name)
+                if not match:
+                    # The DEFAULT partition is never dropped
+                    continue
+
+                if (int(match.group(1)), int(match.group(2))) >= oldest:
+                    continue
+
+                if dry_run:
+                    self.stdout.write(f"Would drop partition '{partition_name}'")
+                else:
+                    # Detach first so the DROP doesn't lock the parent table
+                    cursor.execute(
+                        f'ALTER TABLE core_apiauditlog DETACH PARTITION "{partition_name}"'
+                    )
+                    cursor.execute(f'DROP TABLE "{partition_name}"')
+                    self.stdout.write(f"Partition '{partition_name}' dropped")
+                dropped += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{dropped} audit log partition(s) past retention")
+        )
@@ -0,0 +1,17 @@
+"""
+Django command to refresh the daily API metrics materialized view
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+
+class Command(BaseCommand):
+    help = 'Refreshes the mv_api_metrics_daily materialized view (run hourly)'
+
+    def handle(self, *args, **options):
+        with connection.cursor() as cursor:
+            # CONCURRENTLY keeps the view readable while it is rebuilt
+            cursor.execute('REFRESH MATERIALIZED VIEW CONCURRENTLY mv_api_metrics_daily')
+
+        self.stdout.write(self.style.SUCCESS('Daily API metrics refreshed'))
@@ -1,20 +1,73 @@
+import os
+import re
 import time
 import json
 import logging
 from django.utils.deprecation import MiddlewareMixin
 from django.http import HttpResponse
-from django.contrib.auth.models import AnonymousUser
 from django.core.cache import cache
 from django.db import connection
+from django.db.models import F
 from django.utils import timezone
-from .models import APIAuditLog
-import uuid
+from .audit import record_audit
+from .models import UserProfile
+from .responses import reset_request_timestamp, set_request_timestamp, utc_now_iso
 
 # Loggers
 audit_logger = logging.getLogger('core.audit')
 security_logger = logging.getLogger('django.security')
 
 
+def get_client_ip(request):
+    """Get real client IP address, cached on the request after first lookup"""
+    # DRF wraps the HttpRequest; cache on the underlying one so middlewares
+    # and permission classes share the same value
+    request = getattr(request, '_request', request)
+    try:
+        return request._client_ip
+    except AttributeError:
+        pass
+
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        # Only the first hop is needed; partition stops at the first comma
+        ip = x_forwarded_for.partition(',')[0].strip()
+    else:
+        ip = request.META.get('REMOTE_ADDR', '')
+
+    request._client_ip = ip
+    return ip
+
+
+def is_authenticated_request(request):
+    """Check whether the request user is authenticated, cached on the request"""
+    try:
+        return request._authed
+    except AttributeError:
+        pass
+
+    user = getattr(request, 'user', None)
+    if user is None:
+        # Authentication middleware hasn't run yet; don't cache
+        return False
+
+    request._authed = bool(user.is_authenticated)
+    return request._authed
+
+
+class RequestTimestampMiddleware(MiddlewareMixin):
+    """Compute the response envelope timestamp once per request"""
+
+    def process_request(self, request):
+        request._timestamp_token = set_request_timestamp(utc_now_iso())
+
+    def process_response(self, request, response):
+        token = getattr(request, '_timestamp_token', None)
+        if token is not None:
+            reset_request_timestamp(token)
+        return response
+
+
 class APIAuditMiddleware(MiddlewareMixin):
     """Comprehensive API audit logging middleware"""
 
@@ -24,7 +77,7 @@ class APIAuditMiddleware(MiddlewareMixin):
         request._audit_initial_queries = len(connection.queries)
 
         # Generate request ID
-        request._audit_request_id = str(uuid.uuid4())
+        request._audit_request_id = os.urandom(16).hex()
 
         return None
 
@@ -42,63 +95,40 @@ class APIAuditMiddleware(MiddlewareMixin):
             # Calculate DB time
             db_time = sum(float(query['time']) for query in connection.queries[-db_queries:]) * 1000 if db_queries > 0 else 0
 
-            # Get request data
-            request_body = None
-            if hasattr(request, 'body') and request.body:
-                try:
-                    if request.content_type == 'application/json':
-                        request_body = json.loads(request.body.decode('utf-8'))
-                    else:
-                        request_body = {'content_type': request.content_type, 'size': len(request.body)}
-                except:
-                    request_body = {'error': 'Could not parse request body'}
-
-            # Security risk assessment
-            risk_score = self._calculate_risk_score(request, response)
-            is_suspicious = risk_score > 70
-
-            # Create audit log entry
-            user = getattr(request, 'user', None)
-            audit_data = {
-                'user': user if user and not isinstance(user, AnonymousUser) else None,
+            try:
+                body = request.body
+            except Exception:
+                body = b''
+
+            api_version = request.META.get('HTTP_X_API_VERSION', 'v1')
+
+            # Snapshot only what the background writer needs; enrichment and
+            # the INSERT happen off the request path
+            record_audit({
+                'meta': {k: v for k, v in request.META.items() if k.startswith('HTTP_')},
+                'user_id': request.user.pk if is_authenticated_request(request) else None,
                 'session_id': request.session.session_key or '',
                 'method': request.method,
-                'endpoint': request.path,
-                'full_url': request.build_absolute_uri(),
+                'path': request.path,
+                'scheme': request.scheme,
+                'host': request.META.get('HTTP_HOST') or request.META.get('SERVER_NAME', ''),
+                'full_path': request.get_full_path(),
                 'ip_address': self._get_client_ip(request),
-                'user_agent': request.META.get('HTTP_USER_AGENT', '')[:500],
-                'referer': request.META.get('HTTP_REFERER'),
-                'request_headers': self._get_safe_headers(request),
-                'request_body': request_body,
-                'response_status': response.status_code,
-                'response_size': len(response.content) if hasattr(response, 'content') else 0,
-                'response_time_ms': response_time,
-                'db_queries_count': db_queries,
-                'db_time_ms': db_time,
-                'is_suspicious': is_suspicious,
-                'risk_score': risk_score,
-                'api_version': request.META.get('HTTP_X_API_VERSION', 'v1'),
-                'additional_data': {
-                    'request_id': request._audit_request_id,
-                    'content_type': getattr(request, 'content_type', ''),
-                }
-            }
-
-            # Log to database (async to avoid blocking)
-            try:
-                APIAuditLog.objects.create(**audit_data)
-            except Exception as e:
-                # Log to file if DB fails
-                audit_logger.error(f"Failed to create audit log: {e}")
-
-            # Log suspicious activity
-            if is_suspicious:
-                security_logger.warning(f"Suspicious activity detected: {request.method} {request.path} from {audit_data['ip_address']} (Risk Score: {risk_score})")
+                'content_type': getattr(request, 'content_type', ''),
+                'body': body,
+                'status': response.status_code,
+                'size': len(response.content) if hasattr(response, 'content') else 0,
+                'response_time': response_time,
+                'db_queries': db_queries,
+                'db_time': db_time,
+                'api_version': api_version,
+                'request_id': request._audit_request_id,
+            })
 
             # Add response headers
             response['X-Request-ID'] = request._audit_request_id
             response['X-Response-Time'] = f"{response_time:.2f}ms"
-            response['X-API-Version'] = audit_data['api_version']
+            response['X-API-Version'] = api_version
 
         except Exception as e:
             # Don't break the response if audit fails
@@ -108,69 +138,7 @@ class APIAuditMiddleware(MiddlewareMixin):
 
     def _get_client_ip(self, request):
         """Get real client IP address"""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0].strip()
-        else:
-            ip = request.META.get('REMOTE_ADDR', '')
-        return ip
-
-    def _get_safe_headers(self, request):
-        """Get safe headers (without sensitive information)"""
-        safe_headers = {}
-        sensitive_headers = ['authorization', 'cookie', 'x-api-key', 'x-auth-token']
-
-        for key, value in request.META.items():
-            if key.startswith('HTTP_'):
-                header_name = key[5:].lower().replace('_', '-')
-                if header_name not in sensitive_headers:
-                    safe_headers[header_name] = value[:200]  # Limit length
-                else:
-                    safe_headers[header_name] = '[REDACTED]'
-
-        return safe_headers
-
-    def _calculate_risk_score(self, request, response):
-        """Calculate risk score based on various factors"""
-        risk_score = 0
-
-        # High status codes
-        if response.status_code >= 400:
-            risk_score += 20
-        if response.status_code == 404:
-            risk_score += 10
-        if response.status_code == 403:
-            risk_score += 30
-
-        # Suspicious user agents
-        user_agent = request.META.get('HTTP_USER_AGENT', '').lower()
-        suspicious_agents = ['bot', 'crawler', 'spider', 'scan', 'curl', 'wget']
-        if any(agent in user_agent for agent in suspicious_agents):
-            risk_score += 25
-
-        # Unusual paths
-        path = request.path.lower()
-        suspicious_paths = ['/admin', '/.env', '/config', '/wp-admin', '/phpmyadmin']
-        if any(sus_path in path for sus_path in suspicious_paths):
-            risk_score += 40
-
-        # High request frequency from same IP
-        ip = self._get_client_ip(request)
-        cache_key = f"request_count_{ip}"
-        request_count = cache.get(cache_key, 0)
-        if request_count > 100:  # More than 100 requests per minute
-            risk_score += 30
-
-        cache.set(cache_key, request_count + 1, 60)  # 1 minute window
-
-        # Anonymous user accessing sensitive endpoints
-        user = getattr(request, 'user', None)
-        if not user or isinstance(user, AnonymousUser):
-            sensitive_endpoints = ['/api/', '/admin/']
-            if any(endpoint in path for endpoint in sensitive_endpoints):
-                risk_score += 15
-
-        return min(risk_score, 100)  # Cap at 100
+        return get_client_ip(request)
 
 
 class SecurityHeadersMiddleware(MiddlewareMixin):
@@ -196,8 +164,8 @@ class SecurityHeadersMiddleware(MiddlewareMixin):
         )
         response['Content-Security-Policy'] = csp_policy
 
-        # Cache control for sensitive endpoints
-        if '/api/' in request.path:
+        # Cache control for sensitive endpoints, unless the view set its own
+        if '/api/' in request.path and not response.has_header('Cache-Control'):
             response['Cache-Control'] = 'no-cache, no-store, must-revalidate'
             response['Pragma'] = 'no-cache'
             response['Expires'] = '0'
@@ -205,6 +173,17 @@ class SecurityHeadersMiddleware(MiddlewareMixin):
         return response
 
 
+# Prebuilt 429 bodies, one per rate limit tier
+_RATE_LIMIT_BODIES = {
+    limit: json.dumps({
+        'error': 'Rate limit exceeded',
+        'message': f'Too many requests. Limit: {limit} per minute.',
+        'retry_after': 60
+    }).encode('utf-8')
+    for limit in (60, 200, 1000)
+}
+
+
 class RateLimitMiddleware(MiddlewareMixin):
     """Rate limiting middleware with different limits per user type"""
 
@@ -217,10 +196,11 @@ class RateLimitMiddleware(MiddlewareMixin):
         ip = self._get_client_ip(request)
 
         # Check if user is available (after authentication middleware)
-        user = getattr(request, 'user', None)
+        authed = is_authenticated_request(request)
+        user = request.user if authed else None
 
         # Determine rate limit
-        if not user or isinstance(user, AnonymousUser):
+        if not authed:
             limit = 60  # 60 requests per minute for anonymous users
             window = 60
             prefix = f"rate_limit_anon_{ip}"
@@ -238,15 +218,11 @@ class RateLimitMiddleware(MiddlewareMixin):
 
         if current_count >= limit:
             # Rate limit exceeded
-            username = user.username if user and not isinstance(user, AnonymousUser) else 'anonymous'
+            username = user.get_username() if authed else 'anonymous'
             security_logger.warning(f"Rate limit exceeded for {ip} (user: {username})")
 
             response = HttpResponse(
-                json.dumps({
-                    'error': 'Rate limit exceeded',
-                    'message': f'Too many requests. Limit: {limit} per minute.',
-                    'retry_after': 60
-                }),
+                _RATE_LIMIT_BODIES[limit],
                 content_type='application/json',
                 status=429
             )
@@ -269,12 +245,11 @@ class RateLimitMiddleware(MiddlewareMixin):
     def process_response(self, request, response):
         # Add rate limit headers
         if '/api/' in request.path:
-            user = getattr(request, 'user', None)
-
-            if not user or isinstance(user, AnonymousUser):
+            if not is_authenticated_request(request):
                 limit = 60
                 prefix = f"rate_limit_anon_{self._get_client_ip(request)}"
             else:
+                user = request.user
                 limit = 1000 if (hasattr(user, 'profile') and user.profile.is_premium) else 200
                 prefix = f"rate_limit_user_{user.id}"
 
@@ -289,12 +264,16 @@ class RateLimitMiddleware(MiddlewareMixin):
 
     def _get_client_ip(self, request):
         """Get real client IP address"""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0].strip()
-        else:
-            ip = request.META.get('REMOTE_ADDR', '')
-        return ip
+        return get_client_ip(request)
+
+
+# Per-endpoint profile counters, resolved with a single regex scan
+_COUNTER_RE = re.compile(r'content|image|embedding')
+_COUNTER_FIELDS = {
+    'content': 'total_content_created',
+    'image': 'total_images_generated',
+    'embedding': 'total_embeddings_created',
+}
 
 
 class UserActivityTrackingMiddleware(MiddlewareMixin):
@@ -302,35 +281,27 @@ class UserActivityTrackingMiddleware(MiddlewareMixin):
 
     def process_response(self, request, response):
         # Only track API calls for authenticated users
-        user = getattr(request, 'user', None)
-        if (not user or isinstance(user, AnonymousUser) or
+        if (not is_authenticated_request(request) or
             not request.path.startswith('/api/') or
             response.status_code >= 400):
             return response
 
         try:
             # Update user profile activity
-            profile = user.profile
+            profile = request.user.profile
 
             # Increment API usage if successful
             if 200 <= response.status_code < 300:
                 profile.increment_api_usage()
 
                 # Update specific counters based on endpoint
-                if 'content' in request.path:
-                    profile.total_content_created += 1 if request.method == 'POST' else 0
-                elif 'image' in request.path:
-                    profile.total_images_generated += 1 if request.method == 'POST' else 0
-                elif 'embedding' in request.path:
-                    profile.total_embeddings_created += 1 if request.method == 'POST' else 0
-
-                # Save if any counters were updated
                 if request.method == 'POST':
-                    profile.save(update_fields=[
-                        'total_content_created',
-                        'total_images_generated',
-                        'total_embeddings_created'
-                    ])
+                    match = _COUNTER_RE.search(request.path)
+                    if match:
+                        field = _COUNTER_FIELDS[match.group()]
+                        UserProfile.objects.filter(pk=profile.pk).update(
+                            **{field: F(field) + 1}
+                        )
 
         except Exception as e:
             # Don't break the response if tracking fails
@@ -0,0 +1,126 @@
+from django.db import migrations
+
+
+# Converts core_apiauditlog into a PostgreSQL table RANGE-partitioned by
+# month on "timestamp". INSERTs land in a small, hot partition and retention
+# becomes a partition DROP instead of a bulk DELETE. Rows that don't fall in
+# a pre-created month go to the DEFAULT partition.
+#
+# PostgreSQL requires the partition key to be part of the primary key, so the
+# table-level key becomes (id, timestamp). The ORM keeps using "id".
+
+CREATE_PARTITION_FUNCTION = """
+CREATE OR REPLACE FUNCTION core_create_apiauditlog_partition(month date)
+RETURNS text AS $$
+DECLARE
+    start_date date := date_trunc('month', month)::date;
+    end_date date := (date_trunc('month', month) + interval '1 month')::date;
+    partition_name text := format('core_apiauditlog_y%sm%s',
+                                  to_char(start_date, 'YYYY'),
+                                  to_char(start_date, 'MM'));
+BEGIN
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF core_apiauditlog '
+        'FOR VALUES FROM (%L) TO (%L)',
+        partition_name, start_date, end_date
+    );
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+PARTITION_TABLE = """
+ALTER TABLE core_apiauditlog RENAME TO core_apiauditlog_old;
+
+CREATE TABLE core_apiauditlog (
+    LIKE core_apiauditlog_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+) PARTITION BY RANGE ("timestamp");
+
+CREATE TABLE core_apiauditlog_default PARTITION OF core_apiauditlog DEFAULT;
+
+SELECT core_create_apiauditlog_partition(now()::date);
+SELECT core_create_apiauditlog_partition((now() + interval '1 month')::date);
+SELECT core_create_apiauditlog_partition((now() + interval '2 months')::date);
+
+INSERT INTO core_apiauditlog SELECT * FROM core_apiauditlog_old;
+DROP TABLE core_apiauditlog_old;
+
+ALTER TABLE core_apiauditlog ADD PRIMARY KEY (id, "timestamp");
+ALTER TABLE core_apiauditlog
+    ADD CONSTRAINT {fk_name}
+    FOREIGN KEY (user_id) REFERENCES auth_user (id)
+    DEFERRABLE INITIALLY DEFERRED;
+
+CREATE INDEX {user_index_name} ON core_apiauditlog (user_id);
+CREATE INDEX core_apiaud_user_id_95cb53_idx ON core_apiauditlog (user_id, "timestamp");
+CREATE INDEX core_apiaud_endpoin_c02b02_idx ON core_apiauditlog (endpoint, method);
+CREATE INDEX core_apiaud_ip_addr_9177d4_idx ON core_apiauditlog (ip_address, "timestamp");
+CREATE INDEX core_apiaud_respons_8e271e_idx ON core_apiauditlog (response_status, "timestamp");
+CREATE INDEX core_apiaud_is_susp_09c123_idx ON core_apiauditlog (is_suspicious, risk_score);
+"""
+
+UNPARTITION_TABLE = """
+ALTER TABLE core_apiauditlog RENAME TO core_apiauditlog_partitioned;
+
+CREATE TABLE core_apiauditlog (
+    LIKE core_apiauditlog_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+);
+
+INSERT INTO core_apiauditlog SELECT * FROM core_apiauditlog_partitioned;
+DROP TABLE core_apiauditlog_partitioned CASCADE;
+
+ALTER TABLE core_apiauditlog ADD PRIMARY KEY (id);
+ALTER TABLE core_apiauditlog
+    ADD CONSTRAINT {fk_name}
+    FOREIGN KEY (user_id) REFERENCES auth_user (id)
+    DEFERRABLE INITIALLY DEFERRED;
+
+CREATE INDEX {user_index_name} ON core_apiauditlog (user_id);
+CREATE INDEX core_apiaud_user_id_95cb53_idx ON core_apiauditlog (user_id, "timestamp");
+CREATE INDEX core_apiaud_endpoin_c02b02_idx ON core_apiauditlog (endpoint, method);
+CREATE INDEX core_apiaud_ip_addr_9177d4_idx ON core_apiauditlog (ip_address, "timestamp");
+CREATE INDEX core_apiaud_respons_8e271e_idx ON core_apiauditlog (response_status, "timestamp");
+CREATE INDEX core_apiaud_is_susp_09c123_idx ON core_apiauditlog (is_suspicious, risk_score);
+"""
+
+
+def _constraint_names(apps, schema_editor):
+    # The names Django gave the user FK and its index in 0001, so later
+    # AlterField/RemoveIndex operations find them
+    model = apps.get_model('core', 'APIAuditLog')
+    field = model._meta.get_field('user')
+    return {
+        'fk_name': schema_editor._fk_constraint_name(
+            model, field, '_fk_%(to_table)s_%(to_column)s'
+        ),
+        'user_index_name': schema_editor.quote_name(
+            schema_editor._create_index_name(model._meta.db_table, [field.column], suffix='')
+        ),
+    }
+
+
+def partition_table(apps, schema_editor):
+    schema_editor.execute(
+        PARTITION_TABLE.format(**_constraint_names(apps, schema_editor)), params=None
+    )
+
+
+def unpartition_table(apps, schema_editor):
+    schema_editor.execute(
+        UNPARTITION_TABLE.format(**_constraint_names(apps, schema_editor)), params=None
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=CREATE_PARTITION_FUNCTION,
+            reverse_sql='DROP FUNCTION IF EXISTS core_create_apiauditlog_partition(date);',
+        ),
+        migrations.RunPython(partition_table, unpartition_table),
+    ]
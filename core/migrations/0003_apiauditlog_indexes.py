@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-16 14:20
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_partition_apiauditlog'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='apiauditlog',
+            name='core_apiaud_respons_8e271e_idx',
+        ),
+        migrations.AddIndex(
+            model_name='apiauditlog',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['timestamp'], name='audit_ts_brin', pages_per_range=32),
+        ),
+        migrations.AddIndex(
+            model_name='apiauditlog',
+            index=models.Index(condition=models.Q(('response_status__gte', 400)), fields=['timestamp'], name='audit_err_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='apiauditlog',
+            index=models.Index(condition=models.Q(('is_suspicious', True)), fields=['timestamp'], name='audit_susp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='apiauditlog',
+            index=models.Index(fields=['timestamp'], include=('response_time_ms', 'endpoint'), name='audit_ts_covering_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-16 14:20
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_apiauditlog_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='campaign',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tags'], name='camp_tags_gin', opclasses=['jsonb_path_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='campaign',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['target_platforms'], name='camp_platforms_gin', opclasses=['jsonb_path_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='sourcesite',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['exclude_patterns'], name='site_exclude_gin', opclasses=['jsonb_path_ops']),
+        ),
+    ]
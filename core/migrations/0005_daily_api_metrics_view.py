@@ -0,0 +1,56 @@
+# Generated by Django 5.2.6 on 2026-10-16 14:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Daily API rollup computed from the audit log. Days are bucketed in the
+# project time zone so they line up with timezone.localdate(). The unique
+# index is required by REFRESH MATERIALIZED VIEW CONCURRENTLY.
+
+CREATE_VIEW = """
+CREATE MATERIALIZED VIEW mv_api_metrics_daily AS
+SELECT
+    ("timestamp" AT TIME ZONE %(tz)s)::date AS day,
+    COUNT(*) AS total_api_calls,
+    COUNT(*) FILTER (WHERE response_status < 400) AS successful_api_calls,
+    COUNT(*) FILTER (WHERE response_status >= 400) AS failed_api_calls,
+    AVG(response_time_ms) AS avg_response_time_ms,
+    COUNT(DISTINCT user_id) AS active_users
+FROM core_apiauditlog
+GROUP BY 1;
+
+CREATE UNIQUE INDEX mv_api_metrics_daily_day ON mv_api_metrics_daily (day);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_jsonb_gin_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyAPIMetrics',
+            fields=[
+                ('day', models.DateField(primary_key=True, serialize=False)),
+                ('total_api_calls', models.PositiveIntegerField()),
+                ('successful_api_calls', models.PositiveIntegerField()),
+                ('failed_api_calls', models.PositiveIntegerField()),
+                ('avg_response_time_ms', models.FloatField(null=True)),
+                ('active_users', models.PositiveIntegerField()),
+            ],
+            options={
+                'verbose_name': 'Daily API Metrics',
+                'verbose_name_plural': 'Daily API Metrics',
+                'db_table': 'mv_api_metrics_daily',
+                'ordering': ['-day'],
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(
+            sql=[(CREATE_VIEW, {'tz': settings.TIME_ZONE})],
+            reverse_sql='DROP MATERIALIZED VIEW IF EXISTS mv_api_metrics_daily;',
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-16 14:26
+
+import django.db.models.expressions
+import django.db.models.functions.math
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_daily_api_metrics_view'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sourcesite',
+            name='success_rate',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(then=models.Value(Decimal('0')), total_posts_discovered=0), default=django.db.models.functions.math.Round(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Value(Decimal('100')), '*', models.F('successful_extractions')), '/', models.F('total_posts_discovered')), 2)), output_field=models.DecimalField(decimal_places=2, max_digits=5), verbose_name='Success Rate'),
+        ),
+        migrations.AddIndex(
+            model_name='sourcesite',
+            index=models.Index(fields=['-success_rate'], name='site_success_rate_idx'),
+        ),
+    ]
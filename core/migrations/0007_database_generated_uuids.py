@@ -0,0 +1,59 @@
+# Generated by Django 5.2.6 on 2026-10-16 14:27
+
+import core.models
+import django.contrib.postgres.functions
+from django.db import migrations, models
+
+
+# Primary keys are generated by PostgreSQL instead of uuid.uuid4() in Python.
+# APIAuditLog uses UUIDv7 (48-bit millisecond timestamp + random bits) so new
+# rows land at the right edge of the primary key index instead of splitting
+# random pages. PostgreSQL 16 has no built-in uuidv7(), hence the function.
+
+CREATE_UUIDV7_FUNCTION = """
+CREATE OR REPLACE FUNCTION core_uuidv7() RETURNS uuid AS $$
+    SELECT encode(
+        set_bit(
+            set_bit(
+                overlay(
+                    uuid_send(gen_random_uuid())
+                    PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                    FROM 1 FOR 6
+                ),
+                52, 1
+            ),
+            53, 1
+        ),
+        'hex'
+    )::uuid;
+$$ LANGUAGE sql VOLATILE;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_sourcesite_success_rate'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=CREATE_UUIDV7_FUNCTION,
+            reverse_sql='DROP FUNCTION IF EXISTS core_uuidv7();',
+        ),
+        migrations.AlterField(
+            model_name='apiauditlog',
+            name='id',
+            field=models.UUIDField(db_default=core.models.UUIDv7(), editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='campaign',
+            name='id',
+            field=models.UUIDField(db_default=django.contrib.postgres.functions.RandomUUID(), editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='sourcesite',
+            name='id',
+            field=models.UUIDField(db_default=django.contrib.postgres.functions.RandomUUID(), editable=False, primary_key=True, serialize=False),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-16 14:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_database_generated_uuids'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='apiauditlog',
+            index=models.Index(fields=['-timestamp', '-id'], name='audit_ts_id_idx'),
+        ),
+    ]
@@ -0,0 +1,93 @@
+from django.db import migrations
+
+
+# Rows logged for a month before its partition exists land in the DEFAULT
+# partition, and CREATE TABLE ... PARTITION OF for that month then fails.
+# The function now builds the month as a standalone table, moves the
+# month's rows out of the DEFAULT partition into it and only then attaches
+# it, all in the caller's transaction.
+CREATE_PARTITION_FUNCTION = """
+CREATE OR REPLACE FUNCTION core_create_apiauditlog_partition(month date)
+RETURNS text AS $$
+DECLARE
+    start_date date := date_trunc('month', month)::date;
+    end_date date := (date_trunc('month', month) + interval '1 month')::date;
+    partition_name text := format('core_apiauditlog_y%sm%s',
+                                  to_char(start_date, 'YYYY'),
+                                  to_char(start_date, 'MM'));
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN partition_name;
+    END IF;
+
+    EXECUTE format(
+        'CREATE TABLE %I (LIKE core_apiauditlog '
+        'INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+        partition_name
+    );
+    EXECUTE format(
+        'WITH moved AS ('
+        '    DELETE FROM core_apiauditlog_default'
+        '    WHERE "timestamp" >= %L AND "timestamp" < %L'
+        '    RETURNING *'
+        ') INSERT INTO %I SELECT * FROM moved',
+        start_date, end_date, partition_name
+    );
+    EXECUTE format(
+        'ALTER TABLE core_apiauditlog ATTACH PARTITION %I '
+        'FOR VALUES FROM (%L) TO (%L)',
+        partition_name, start_date, end_date
+    );
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# Names 0002 used to write by hand before it derived Django's own
+LEGACY_FK_NAME = 'core_apiauditlog_user_id_fk_auth_user_id'
+LEGACY_INDEX_NAME = 'core_apiauditlog_user_id'
+
+
+def rename_legacy_constraints(apps, schema_editor):
+    model = apps.get_model('core', 'APIAuditLog')
+    field = model._meta.get_field('user')
+    fk_name = schema_editor._fk_constraint_name(
+        model, field, '_fk_%(to_table)s_%(to_column)s'
+    )
+    index_name = schema_editor.quote_name(
+        schema_editor._create_index_name(model._meta.db_table, [field.column], suffix='')
+    )
+    schema_editor.execute(
+        f"ALTER INDEX IF EXISTS {LEGACY_INDEX_NAME} RENAME TO {index_name}",
+        params=None,
+    )
+    schema_editor.execute(
+        f"""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM pg_constraint
+                WHERE conname = '{LEGACY_FK_NAME}'
+                  AND conrelid = 'core_apiauditlog'::regclass
+            ) THEN
+                ALTER TABLE core_apiauditlog
+                    RENAME CONSTRAINT {LEGACY_FK_NAME} TO {fk_name};
+            END IF;
+        END
+        $$;
+        """,
+        params=None,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_apiauditlog_keyset_index'),
+    ]
+
+    operations = [
+        # The new function is a drop-in replacement, so there is nothing to undo
+        migrations.RunSQL(CREATE_PARTITION_FUNCTION, migrations.RunSQL.noop),
+        migrations.RunPython(rename_legacy_constraints, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,14 @@
-import uuid
 from django.db import models
+from django.db.models.functions import Round
 from django.contrib.auth.models import User
+from django.contrib.postgres.functions import RandomUUID
+from django.contrib.postgres.indexes import BrinIndex, GinIndex
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 from decimal import Decimal
 
+from . import quota
+
 
 # Choices for various fields
 CONTENT_TYPE_CHOICES = [
@@ -65,6 +69,13 @@ SITE_CATEGORY_CHOICES = [
 ]
 
 
+class UUIDv7(models.Func):
+    """Time-ordered UUID from the core_uuidv7() SQL function (migration 0007)"""
+    function = 'core_uuidv7'
+    template = '%(function)s()'
+    output_field = models.UUIDField()
+
+
 class TimeStampedModel(models.Model):
     """Abstract base model with timestamp fields"""
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Created At")
@@ -170,20 +181,27 @@ class UserProfile(TimeStampedModel):
     def __str__(self):
         return f"{self.user.username} Profile"
 
-    def get_api_usage_percentage(self):
+    def get_current_usage(self):
+        """Get API calls this month, including those not yet flushed to the DB"""
+        return self.api_usage_current_month + quota.get_pending_usage(self.user_id)
+
+    def get_api_usage_percentage(self, usage=None):
         """Calculate API usage percentage"""
         if self.api_quota == 0:
             return 0
-        return round((self.api_usage_current_month / self.api_quota) * 100, 2)
+        if usage is None:
+            usage = self.get_current_usage()
+        return round((usage / self.api_quota) * 100, 2)
 
-    def can_make_api_call(self):
+    def can_make_api_call(self, usage=None):
         """Check if user can make another API call"""
-        return self.api_usage_current_month < self.api_quota
+        if usage is None:
+            usage = self.get_current_usage()
+        return usage < self.api_quota
 
     def increment_api_usage(self):
         """Increment API usage counter"""
-        self.api_usage_current_month += 1
-        self.save(update_fields=['api_usage_current_month'])
+        quota.incr_quota(self.user_id)
 
 
 class Campaign(TimeStampedModel):
@@ -191,7 +209,7 @@ class Campaign(TimeStampedModel):
 
     id = models.UUIDField(
         primary_key=True,
-        default=uuid.uuid4,
+        db_default=RandomUUID(),
         editable=False
     )
 
@@ -283,6 +301,14 @@ class Campaign(TimeStampedModel):
         indexes = [
             models.Index(fields=['owner', 'status']),
             models.Index(fields=['start_date', 'end_date']),
+            # jsonb_path_ops only serves containment (@>) lookups such as
+            # tags__contains=['x']; key/index lookups like tags__0 can't use it
+            GinIndex(fields=['tags'], name='camp_tags_gin', opclasses=['jsonb_path_ops']),
+            GinIndex(
+                fields=['target_platforms'],
+                name='camp_platforms_gin',
+                opclasses=['jsonb_path_ops']
+            ),
         ]
 
     def __str__(self):
@@ -290,11 +316,18 @@ class Campaign(TimeStampedModel):
 
     def get_content_count(self):
         """Get total content pieces in this campaign"""
-        return self.content_pieces.count()
+        # Annotated by the campaign views; count directly otherwise
+        count = getattr(self, '_content_count', None)
+        if count is None:
+            count = self.content_pieces.count()
+        return count
 
     def get_published_content_count(self):
         """Get published content pieces count"""
-        return self.content_pieces.filter(status='published').count()
+        count = getattr(self, '_published_count', None)
+        if count is None:
+            count = self.content_pieces.filter(status='published').count()
+        return count
 
 
 class SourceSite(TimeStampedModel):
@@ -302,7 +335,7 @@ class SourceSite(TimeStampedModel):
 
     id = models.UUIDField(
         primary_key=True,
-        default=uuid.uuid4,
+        db_default=RandomUUID(),
         editable=False
     )
 
@@ -403,6 +436,20 @@ class SourceSite(TimeStampedModel):
         default=0,
         verbose_name="Failed Extractions"
     )
+    # Stored by Postgres so lists can sort and filter on it
+    success_rate = models.GeneratedField(
+        expression=models.Case(
+            models.When(total_posts_discovered=0, then=models.Value(Decimal('0'))),
+            default=Round(
+                Decimal('100') * models.F('successful_extractions')
+                / models.F('total_posts_discovered'),
+                2
+            ),
+        ),
+        output_field=models.DecimalField(max_digits=5, decimal_places=2),
+        db_persist=True,
+        verbose_name="Success Rate"
+    )
 
     # Error Tracking
     last_error = models.TextField(
@@ -429,25 +476,36 @@ class SourceSite(TimeStampedModel):
             models.Index(fields=['owner', 'is_active']),
             models.Index(fields=['next_check']),
             models.Index(fields=['category', 'is_public']),
+            models.Index(fields=['-success_rate'], name='site_success_rate_idx'),
+            GinIndex(
+                fields=['exclude_patterns'],
+                name='site_exclude_gin',
+                opclasses=['jsonb_path_ops']
+            ),
         ]
 
     def __str__(self):
         return f"{self.name} ({self.url})"
 
     def get_success_rate(self):
-        """Calculate extraction success rate"""
-        total = self.total_posts_discovered
-        if total == 0:
-            return 0
-        return round((self.successful_extractions / total) * 100, 2)
+        """Get extraction success rate"""
+        return float(self.success_rate)
 
 
 class APIAuditLog(models.Model):
-    """Comprehensive API audit logging"""
+    """
+    Comprehensive API audit logging
 
+    The table is RANGE-partitioned by month on ``timestamp`` (see migration
+    0002). Run ``manage.py create_audit_partitions`` periodically so upcoming
+    months get their own partition, and ``manage.py drop_audit_partitions``
+    nightly to drop months past the retention period.
+    """
+
+    # Time-ordered, so inserts append to the primary key index
     id = models.UUIDField(
         primary_key=True,
-        default=uuid.uuid4,
+        db_default=UUIDv7(),
         editable=False
     )
 
@@ -581,8 +639,28 @@ class APIAuditLog(models.Model):
             models.Index(fields=['user', 'timestamp']),
             models.Index(fields=['endpoint', 'method']),
             models.Index(fields=['ip_address', 'timestamp']),
-            models.Index(fields=['response_status', 'timestamp']),
             models.Index(fields=['is_suspicious', 'risk_score']),
+            # Append-only table: a BRIN on timestamp is tiny compared to a btree
+            BrinIndex(fields=['timestamp'], pages_per_range=32, name='audit_ts_brin'),
+            # Keyset pagination order for the audit log endpoint
+            models.Index(fields=['-timestamp', '-id'], name='audit_ts_id_idx'),
+            # "Errors in the last hour" / "suspicious today"
+            models.Index(
+                fields=['timestamp'],
+                name='audit_err_idx',
+                condition=models.Q(response_status__gte=400)
+            ),
+            models.Index(
+                fields=['timestamp'],
+                name='audit_susp_idx',
+                condition=models.Q(is_suspicious=True)
+            ),
+            # Slow request reports read these columns straight from the index
+            models.Index(
+                fields=['timestamp'],
+                name='audit_ts_covering_idx',
+                include=['response_time_ms', 'endpoint']
+            ),
         ]
 
     def __str__(self):
@@ -651,4 +729,30 @@ class SystemMetrics(TimeStampedModel):
         ordering = ['-metrics_date']
 
     def __str__(self):
-        return f"Metrics for {self.metrics_date}"
\ No newline at end of file
+        return f"Metrics for {self.metrics_date}"
+
+
+class DailyAPIMetrics(models.Model):
+    """
+    Daily API rollup read from the ``mv_api_metrics_daily`` materialized view
+
+    Computed from APIAuditLog instead of counters kept in sync by hand. Run
+    ``manage.py refresh_system_metrics`` hourly to refresh it.
+    """
+
+    day = models.DateField(primary_key=True)
+    total_api_calls = models.PositiveIntegerField()
+    successful_api_calls = models.PositiveIntegerField()
+    failed_api_calls = models.PositiveIntegerField()
+    avg_response_time_ms = models.FloatField(null=True)
+    active_users = models.PositiveIntegerField()
+
+    class Meta:
+        managed = False
+        db_table = 'mv_api_metrics_daily'
+        verbose_name = "Daily API Metrics"
+        verbose_name_plural = "Daily API Metrics"
+        ordering = ['-day']
+
+    def __str__(self):
+        return f"API metrics for {self.day}"
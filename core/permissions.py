@@ -1,9 +1,149 @@
 from rest_framework import permissions
 from rest_framework.throttling import UserRateThrottle
 from django.core.cache import cache
+from django.db.models import BooleanField, Case, Exists, OuterRef, Q, Value, When
 from django.utils import timezone
 from datetime import timedelta
 
+from .blocklist import is_ip_blocked
+from .middleware import get_client_ip
+from .models import Campaign, UserProfile
+from .quota import reset_pending_usage
+
+PERM_CACHE_TIMEOUT = 60  # seconds
+RESOURCE_ACCESS_LIMIT = 100  # accesses to the same object per user per hour
+
+# HTTP method -> Django permission action
+METHOD_ACTIONS = {
+    'GET': 'view',
+    'POST': 'add',
+    'PUT': 'change',
+    'PATCH': 'change',
+    'DELETE': 'delete',
+    'OPTIONS': 'view',
+    'HEAD': 'view',
+}
+
+
+def get_profile(request):
+    """
+    Get the request user's profile, fetched at most once per request
+
+    Returns None when the user has no profile.
+    """
+    # Cache on the underlying HttpRequest so middlewares share it too
+    request = getattr(request, '_request', request)
+    try:
+        return request._cached_profile
+    except AttributeError:
+        pass
+
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        # Not authenticated (yet); don't cache
+        return None
+
+    try:
+        profile = user.profile
+    except UserProfile.DoesNotExist:
+        profile = None
+
+    request._cached_profile = profile
+    return profile
+
+
+def perm_cache_key(user_id, codename):
+    return f"perm_{user_id}_{codename}"
+
+
+def user_has_perm(user, codename):
+    """Check a model permission, caching the result for a short time"""
+    return cache.get_or_set(
+        perm_cache_key(user.id, codename),
+        lambda: user.has_perm(codename),
+        PERM_CACHE_TIMEOUT
+    )
+
+
+OWNER_ATTRS = ('owner', 'creator', 'user')
+
+# Model class -> ownership foreign keys it actually has
+_OWNERSHIP_ATTRS: dict[type, tuple[str, ...]] = {}
+
+
+def get_ownership_attrs(model):
+    """Get the owner/creator/user/campaign foreign keys of a model, once per model"""
+    try:
+        return _OWNERSHIP_ATTRS[model]
+    except KeyError:
+        pass
+
+    try:
+        fields = model._meta.get_fields()
+    except AttributeError:
+        fields = ()  # Not a model
+
+    attrs = tuple(
+        field.name for field in fields
+        if field.name in OWNER_ATTRS + ('campaign',)
+        and field.concrete and (field.many_to_one or field.one_to_one)
+    )
+    _OWNERSHIP_ATTRS[model] = attrs
+    return attrs
+
+
+def is_owned_by(obj, user, attrs=OWNER_ATTRS):
+    """Compare the object's owner foreign key ids, without loading the related rows"""
+    for attr in get_ownership_attrs(type(obj)):
+        if attr in attrs and getattr(obj, f'{attr}_id') == user.id:
+            return True
+    return False
+
+
+def owns_campaign_of(obj, user):
+    """Check access through the object's campaign"""
+    # Annotated by annotate_ownership() when loaded through a secure view
+    campaign_owned = getattr(obj, '_campaign_owned', None)
+    if campaign_owned is not None:
+        return campaign_owned
+
+    if 'campaign' not in get_ownership_attrs(type(obj)) or obj.campaign_id is None:
+        return False
+    return obj.campaign.owner_id == user.id
+
+
+def annotate_ownership(queryset, user):
+    """
+    Annotate ``_is_owner`` (and ``_campaign_owned``) on each row of the queryset
+
+    Ownership is resolved in the same query, so the object permission checks
+    need no attribute or foreign key lookups per object.
+    """
+    attrs = get_ownership_attrs(queryset.model)
+
+    condition = Q()
+    for attr in attrs:
+        if attr in OWNER_ATTRS:
+            condition |= Q(**{f'{attr}_id': user.id})
+
+    if 'campaign' in attrs:
+        queryset = queryset.annotate(
+            _campaign_owned=Exists(
+                Campaign.objects.filter(pk=OuterRef('campaign_id'), owner_id=user.id)
+            )
+        )
+
+    if not condition:
+        return queryset.annotate(_is_owner=Value(False, output_field=BooleanField()))
+
+    return queryset.annotate(
+        _is_owner=Case(
+            When(condition, then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField()
+        )
+    )
+
 
 class EnhancedGlobalPermission(permissions.BasePermission):
     """Enhanced global permission class with improved security"""
@@ -18,8 +158,9 @@ class EnhancedGlobalPermission(permissions.BasePermission):
             return False
 
         # Check API quota
-        if hasattr(request.user, 'profile'):
-            if not request.user.profile.can_make_api_call():
+        profile = get_profile(request)
+        if profile is not None:
+            if not profile.can_make_api_call():
                 self.message = "API quota exceeded. Please upgrade your plan or wait for quota reset."
                 return False
 
@@ -29,7 +170,7 @@ class EnhancedGlobalPermission(permissions.BasePermission):
             return True  # No specific permission required
 
         # Check if user has the permission
-        has_permission = request.user.has_perm(model_permission)
+        has_permission = user_has_perm(request.user, model_permission)
         if not has_permission:
             self.message = f"You don't have permission to {request.method.lower()} this resource."
 
@@ -38,54 +179,42 @@ class EnhancedGlobalPermission(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         """Object-level permissions"""
 
+        # Public objects are readable by everyone; the most common case
+        if request.method in permissions.SAFE_METHODS and getattr(obj, 'is_public', False):
+            return True
+
         # Superusers have all permissions
         if request.user.is_superuser:
             return True
 
         # Check if object has an owner and user is the owner
-        if hasattr(obj, 'owner') and obj.owner == request.user:
+        if is_owned_by(obj, request.user):
             return True
 
-        if hasattr(obj, 'creator') and obj.creator == request.user:
-            return True
-
-        if hasattr(obj, 'user') and obj.user == request.user:
-            return True
-
-        # Check if object is public for read operations
-        if request.method in permissions.SAFE_METHODS:
-            if hasattr(obj, 'is_public') and obj.is_public:
-                return True
-
         # Check campaign access for content pieces
-        if hasattr(obj, 'campaign') and obj.campaign:
-            if obj.campaign.owner == request.user:
-                return True
-
-        return False
+        return owns_campaign_of(obj, request.user)
 
     def _get_model_permission_codename(self, method, view):
         """Get the Django permission codename for the model and action"""
+        # Static per view class and method; memoize on the class itself
+        view_class = type(view)
+        codenames = view_class.__dict__.get('_perm_codenames')
+        if codenames is None:
+            codenames = view_class._perm_codenames = {}
+
+        try:
+            return codenames[method]
+        except KeyError:
+            pass
+
         try:
-            model_name = view.queryset.model._meta.model_name
-            app_label = view.queryset.model._meta.app_label
-            action = self._get_action_suffix(method)
-            return f'{app_label}.{action}_{model_name}'
+            opts = view.queryset.model._meta
+            codename = f'{opts.app_label}.{METHOD_ACTIONS.get(method, "view")}_{opts.model_name}'
         except AttributeError:
-            return None
-
-    def _get_action_suffix(self, method):
-        """Map HTTP methods to Django permission actions"""
-        method_actions = {
-            'GET': 'view',
-            'POST': 'add',
-            'PUT': 'change',
-            'PATCH': 'change',
-            'DELETE': 'delete',
-            'OPTIONS': 'view',
-            'HEAD': 'view',
-        }
-        return method_actions.get(method, 'view')
+            codename = None
+
+        codenames[method] = codename
+        return codename
 
 
 class IsOwnerOrReadOnly(permissions.BasePermission):
@@ -96,12 +225,13 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
 
+        # Annotated by annotate_ownership() when loaded through a secure view
+        is_owner = getattr(obj, '_is_owner', None)
+        if is_owner is not None:
+            return is_owner
+
         # Write permissions only to the owner
-        return (
-            hasattr(obj, 'owner') and obj.owner == request.user or
-            hasattr(obj, 'creator') and obj.creator == request.user or
-            hasattr(obj, 'user') and obj.user == request.user
-        )
+        return is_owned_by(obj, request.user)
 
 
 class IsPremiumUser(permissions.BasePermission):
@@ -111,8 +241,9 @@ class IsPremiumUser(permissions.BasePermission):
         if not request.user or not request.user.is_authenticated:
             return False
 
-        if hasattr(request.user, 'profile'):
-            return request.user.profile.is_premium
+        profile = get_profile(request)
+        if profile is not None:
+            return profile.is_premium
 
         return False
 
@@ -124,13 +255,12 @@ class IsOwnerOrPublic(permissions.BasePermission):
 
     def has_object_permission(self, request, view, obj):
         # Owner always has access
-        if (hasattr(obj, 'owner') and obj.owner == request.user or
-            hasattr(obj, 'creator') and obj.creator == request.user):
+        if is_owned_by(obj, request.user, attrs=('owner', 'creator')):
             return True
 
         # Public content is readable by authenticated users
         if (request.method in permissions.SAFE_METHODS and
-            hasattr(obj, 'is_public') and obj.is_public):
+            getattr(obj, 'is_public', False)):
             return True
 
         return False
@@ -141,14 +271,11 @@ class CanAccessCampaign(permissions.BasePermission):
 
     def has_object_permission(self, request, view, obj):
         # Direct campaign access
-        if hasattr(obj, 'owner'):
-            return obj.owner == request.user
+        if 'owner' in get_ownership_attrs(type(obj)):
+            return obj.owner_id == request.user.id
 
         # Access through campaign relationship
-        if hasattr(obj, 'campaign') and obj.campaign:
-            return obj.campaign.owner == request.user
-
-        return False
+        return owns_campaign_of(obj, request.user)
 
 
 class APIQuotaPermission(permissions.BasePermission):
@@ -158,20 +285,26 @@ class APIQuotaPermission(permissions.BasePermission):
         if not request.user or not request.user.is_authenticated:
             return True  # Let other permissions handle auth
 
-        if hasattr(request.user, 'profile'):
-            profile = request.user.profile
-
+        profile = get_profile(request)
+        if profile is not None:
             # Check if quota reset is needed
             now = timezone.now()
             if now >= profile.quota_reset_date:
-                # Reset quota for new month
-                profile.api_usage_current_month = 0
-                profile.quota_reset_date = now + timedelta(days=30)
-                profile.save(update_fields=['api_usage_current_month', 'quota_reset_date'])
+                # Reset quota for new month; the condition makes concurrent
+                # requests reset it only once
+                reset = UserProfile.objects.filter(
+                    pk=profile.pk, quota_reset_date__lte=now
+                ).update(
+                    api_usage_current_month=0,
+                    quota_reset_date=now + timedelta(days=30)
+                )
+                if reset:
+                    reset_pending_usage(profile.user_id)
+                profile.refresh_from_db(fields=['api_usage_current_month', 'quota_reset_date'])
 
             # Check quota
             if not profile.can_make_api_call():
-                self.message = f"API quota exceeded ({profile.api_usage_current_month}/{profile.api_quota}). Upgrade your plan for higher limits."
+                self.message = f"API quota exceeded ({profile.get_current_usage()}/{profile.api_quota}). Upgrade your plan for higher limits."
                 return False
 
         return True
@@ -183,37 +316,29 @@ class SecureResourceAccess(permissions.BasePermission):
     def has_permission(self, request, view):
         # Block access from suspicious IPs
         ip = self._get_client_ip(request)
-        blocked_ips_key = f"blocked_ip_{ip}"
 
-        if cache.get(blocked_ips_key):
+        if is_ip_blocked(ip):
             self.message = "Access blocked due to suspicious activity."
             return False
 
         return True
 
     def has_object_permission(self, request, view, obj):
-        # Check for resource-specific access patterns
-        user_id = request.user.id if request.user.is_authenticated else None
-
-        # Track resource access patterns
-        if user_id:
-            access_key = f"resource_access_{user_id}_{obj.__class__.__name__}_{obj.pk}"
-            access_count = cache.get(access_key, 0)
+        # Track resource access patterns per user and object
+        if request.user.is_authenticated:
+            access_key = f"resource_access_{request.user.id}_{obj.__class__.__name__}_{obj.pk}"
+            # add() only sets the 1 hour window on the first access; incr()
+            # counts atomically instead of a get/set pair
+            cache.add(access_key, 0, 3600)
+            access_count = cache.incr(access_key)
 
             # Suspicious if accessing same resource too many times
-            if access_count > 100:  # 100 accesses to same resource per hour
+            if access_count > RESOURCE_ACCESS_LIMIT:
                 self.message = "Too many accesses to this resource."
                 return False
 
-            cache.set(access_key, access_count + 1, 3600)  # 1 hour
-
         return True
 
     def _get_client_ip(self, request):
         """Get client IP address"""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0].strip()
-        else:
-            ip = request.META.get('REMOTE_ADDR', '')
-        return ip
\ No newline at end of file
+        return get_client_ip(request)
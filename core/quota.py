@@ -0,0 +1,92 @@
+"""
+Buffered API quota counters
+
+When the default cache is shared by every worker (Redis, Memcached), each
+API call bumps a per-user counter in the cache instead of issuing an
+UPDATE. The pending delta is folded into ``UserProfile.api_usage_current_month``
+with a single F() expression once FLUSH_EVERY calls have accumulated or
+FLUSH_INTERVAL seconds have passed since the last flush.
+
+With a per-process cache (LocMemCache) the counts would be invisible to the
+other workers and lost on restart, so every call is written straight to the
+database with an atomic F() update instead.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+FLUSH_EVERY = 50  # increments
+FLUSH_INTERVAL = 30  # seconds
+
+SHARED_CACHE_BACKENDS = (
+    'django_redis.cache.RedisCache',
+    'django.core.cache.backends.redis.RedisCache',
+    'django.core.cache.backends.memcached.PyMemcacheCache',
+    'django.core.cache.backends.memcached.PyLibMCCache',
+)
+
+
+def is_buffered():
+    """Whether increments are buffered in a cache shared by all workers"""
+    return settings.CACHES['default']['BACKEND'] in SHARED_CACHE_BACKENDS
+
+
+def _pending_key(user_id):
+    return f"quota_pending_{user_id}"
+
+
+def _flushed_key(user_id):
+    return f"quota_flushed_{user_id}"
+
+
+def _add_usage(user_id, delta):
+    from .models import UserProfile
+
+    UserProfile.objects.filter(user_id=user_id).update(
+        api_usage_current_month=F('api_usage_current_month') + delta
+    )
+
+
+def get_pending_usage(user_id):
+    """Get API calls counted in the cache but not yet written to the DB"""
+    if not is_buffered():
+        return 0
+    return cache.get(_pending_key(user_id), 0)
+
+
+def incr_quota(user_id):
+    """Count one API call for the user"""
+    if not is_buffered():
+        _add_usage(user_id, 1)
+        return
+
+    key = _pending_key(user_id)
+    try:
+        pending = cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        pending = cache.incr(key)
+
+    # cache.add only succeeds once the previous flush window has expired
+    if pending >= FLUSH_EVERY or cache.add(_flushed_key(user_id), 1, FLUSH_INTERVAL):
+        flush_quota(user_id)
+
+
+def flush_quota(user_id):
+    """Write the pending API calls for the user to the database"""
+    if not is_buffered():
+        return
+
+    key = _pending_key(user_id)
+    delta = cache.get(key, 0)
+    if not delta:
+        return
+
+    # decr keeps any increments that landed after the get above
+    cache.decr(key, delta)
+    _add_usage(user_id, delta)
+
+
+def reset_pending_usage(user_id):
+    """Drop pending API calls, e.g. when the monthly quota resets"""
+    cache.delete(_pending_key(user_id))
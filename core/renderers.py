@@ -0,0 +1,53 @@
+"""
+orjson-based JSON rendering for API responses
+"""
+from decimal import Decimal
+
+import orjson
+from django.utils.functional import Promise
+from rest_framework.renderers import BaseRenderer
+
+OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj):
+    """Encode the types orjson doesn't handle natively"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, Promise):
+        return str(obj)  # Lazy translation strings
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    if hasattr(obj, '__iter__'):
+        return list(obj)
+    return str(obj)
+
+
+def dumps(data, indent=False):
+    """Serialize data to JSON bytes"""
+    options = OPTIONS | orjson.OPT_INDENT_2 if indent else OPTIONS
+    return orjson.dumps(data, default=_default, option=options)
+
+
+def raw_json(text):
+    """Wrap already-encoded JSON so dumps() embeds it without re-encoding"""
+    return orjson.Fragment(text)
+
+
+class ORJSONRenderer(BaseRenderer):
+    """Renders responses with orjson instead of the json module"""
+
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        indent = False
+        if accepted_media_type:
+            # Honour "Accept: application/json; indent=N" like JSONRenderer
+            indent = 'indent=' in accepted_media_type
+
+        return dumps(data, indent=indent)
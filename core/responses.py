@@ -3,15 +3,107 @@ Standardized API response system for consistent formatting
 """
 from rest_framework import status
 from rest_framework.response import Response
-from django.utils import timezone
+from django.http import HttpResponse, StreamingHttpResponse
 from django.core.paginator import Paginator, Page
+from django.db import connections
 from django.db.models import QuerySet
-from rest_framework.pagination import PageNumberPagination
+from django.utils.cache import parse_etags
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.utils.urls import remove_query_param
 from typing import Any, Dict, List, Optional, Union
+from contextvars import ContextVar
+import hashlib
 import logging
+import time
+
+from .renderers import dumps
 
 logger = logging.getLogger(__name__)
 
+# Pages with more rows than this are streamed instead of rendered in one go
+STREAM_THRESHOLD = 50
+
+# Pre-encoded envelope openings for the common 4xx responses
+_ERROR_PREFIXES = {
+    error_code: dumps({'success': False, 'error_code': error_code})[:-1]
+    for error_code in ('NOT_FOUND', 'UNAUTHORIZED', 'FORBIDDEN')
+}
+
+
+class _LogSampler:
+    """
+    Per-key token bucket for log lines
+
+    Allows ``rate`` lines per second for each key, with bursts of up to
+    ``burst`` lines, so floods of the same 4xx don't flood the logs.
+    """
+
+    def __init__(self, rate: float = 1.0, burst: int = 10):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[Any, tuple] = {}  # key -> (tokens, last refill)
+
+    def allow(self, key) -> bool:
+        now = time.monotonic()
+        tokens, last = self._buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+
+        allowed = tokens >= 1
+        self._buckets[key] = (tokens - 1 if allowed else tokens, now)
+        return allowed
+
+
+_log_sampler = _LogSampler()
+
+
+# Set once per request by RequestTimestampMiddleware
+_request_timestamp: ContextVar[Optional[str]] = ContextVar('request_timestamp', default=None)
+
+
+def set_request_timestamp(timestamp: str):
+    """Use the given ISO timestamp for responses built in this context"""
+    return _request_timestamp.set(timestamp)
+
+
+def reset_request_timestamp(token) -> None:
+    """Undo set_request_timestamp()"""
+    _request_timestamp.reset(token)
+
+
+def utc_now_iso() -> str:
+    """
+    Get the current UTC time as an ISO 8601 string
+
+    Formats straight from time.time_ns() instead of building a tz-aware
+    datetime and calling isoformat().
+    """
+    seconds, nanoseconds = divmod(time.time_ns(), 1_000_000_000)
+    tm = time.gmtime(seconds)
+    return (
+        f"{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d}"
+        f"T{tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d}"
+        f".{nanoseconds // 1000:06d}Z"
+    )
+
+
+def _now_iso() -> str:
+    """Get the response timestamp, reusing the request's when there is one"""
+    return _request_timestamp.get() or utc_now_iso()
+
+
+def _static_error(message: str, error_code: str, status_code: int) -> HttpResponse:
+    """Build a 4xx error envelope from its pre-encoded opening"""
+    if _log_sampler.allow(error_code):
+        logger.error("API Error: %s (Code: %s)", message, error_code)
+
+    body = b''.join((
+        _ERROR_PREFIXES[error_code],
+        b',"error":', dumps(message),
+        b',"timestamp":"', _now_iso().encode(), b'"}',
+    ))
+    return HttpResponse(body, status=status_code, content_type='application/json')
+
 
 class StandardizedResponse:
     """Class for creating standardized API responses"""
@@ -39,7 +131,7 @@ class StandardizedResponse:
             'success': True,
             'message': message,
             'data': data,
-            'timestamp': timezone.now().isoformat()
+            'timestamp': _now_iso()
         }
 
         if meta:
@@ -47,6 +139,96 @@ class StandardizedResponse:
 
         return Response(response_data, status=status_code)
 
+    @staticmethod
+    def conditional_success(
+        request,
+        data: Any = None,
+        message: str = "Request successful",
+        meta: Optional[Dict] = None,
+        status_code: int = status.HTTP_200_OK,
+        max_age: int = 60
+    ) -> Response:
+        """
+        Create a standardized success response with an ETag
+
+        Returns 304 Not Modified, without a body, when the client's
+        If-None-Match already matches the data.
+
+        Args:
+            request: Request being answered
+            data: Response data
+            message: Success message
+            meta: Additional metadata
+            status_code: HTTP status code
+            max_age: Seconds the client may reuse the response
+
+        Returns:
+            Response object with standardized format, or a 304 response
+        """
+        digest = hashlib.blake2b(dumps([data, meta]), digest_size=16).hexdigest()
+        etag = f'"{digest}"'
+        cache_control = f'private, max-age={max_age}'
+
+        # Weak comparison: GZipMiddleware sends the tag back as W/"..."
+        if_none_match = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+        if '*' in if_none_match or etag in (
+            tag.removeprefix('W/') for tag in if_none_match
+        ):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={
+                'ETag': etag, 'Cache-Control': cache_control,
+            })
+
+        response = StandardizedResponse.success(data, message, meta, status_code)
+        response['ETag'] = etag
+        response['Cache-Control'] = cache_control
+        return response
+
+    @staticmethod
+    def stream_success(
+        data: List[Any],
+        message: str = "Request successful",
+        meta: Optional[Dict] = None,
+        status_code: int = status.HTTP_200_OK
+    ) -> StreamingHttpResponse:
+        """
+        Create a standardized success response that is streamed row by row
+
+        Same envelope as success(), but the rows are encoded one at a time
+        with orjson so the whole body is never held as a single string.
+
+        Args:
+            data: List of already serialized rows
+            message: Success message
+            meta: Additional metadata
+            status_code: HTTP status code
+
+        Returns:
+            StreamingHttpResponse with standardized format
+        """
+        envelope = {
+            'success': True,
+            'message': message,
+            'timestamp': _now_iso()
+        }
+
+        if meta:
+            envelope['meta'] = meta
+
+        def generate():
+            # Open the envelope and leave it open for the data array
+            yield dumps(envelope)[:-1] + b',"data":['
+            for index, row in enumerate(data):
+                if index:
+                    yield b','
+                yield dumps(row)
+            yield b']}'
+
+        return StreamingHttpResponse(
+            generate(),
+            status=status_code,
+            content_type='application/json'
+        )
+
     @staticmethod
     def error(
         error: str,
@@ -69,7 +251,7 @@ class StandardizedResponse:
         response_data = {
             'success': False,
             'error': error,
-            'timestamp': timezone.now().isoformat()
+            'timestamp': _now_iso()
         }
 
         if details:
@@ -78,8 +260,9 @@ class StandardizedResponse:
         if error_code:
             response_data['error_code'] = error_code
 
-        # Log error for monitoring
-        logger.error(f"API Error: {error} (Code: {error_code}) - Details: {details}")
+        # Log error for monitoring; client errors are rate limited per code
+        if status_code >= 500 or _log_sampler.allow(error_code):
+            logger.error("API Error: %s (Code: %s) - Details: %s", error, error_code, details)
 
         return Response(response_data, status=status_code)
 
@@ -102,10 +285,11 @@ class StandardizedResponse:
             'success': False,
             'error': message,
             'validation_errors': validation_errors,
-            'timestamp': timezone.now().isoformat()
+            'timestamp': _now_iso()
         }
 
-        logger.warning(f"Validation Error: {validation_errors}")
+        if _log_sampler.allow('VALIDATION_ERROR'):
+            logger.warning("Validation Error: %s", validation_errors)
 
         return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
 
@@ -113,7 +297,7 @@ class StandardizedResponse:
     def not_found(
         resource: str = "Resource",
         resource_id: Optional[str] = None
-    ) -> Response:
+    ) -> HttpResponse:
         """
         Create a standardized not found response
 
@@ -128,16 +312,12 @@ class StandardizedResponse:
         if resource_id:
             message += f" (ID: {resource_id})"
 
-        return StandardizedResponse.error(
-            error=message,
-            error_code="NOT_FOUND",
-            status_code=status.HTTP_404_NOT_FOUND
-        )
+        return _static_error(message, "NOT_FOUND", status.HTTP_404_NOT_FOUND)
 
     @staticmethod
     def unauthorized(
         message: str = "Authentication required"
-    ) -> Response:
+    ) -> HttpResponse:
         """
         Create a standardized unauthorized response
 
@@ -147,16 +327,12 @@ class StandardizedResponse:
         Returns:
             Response object with unauthorized format
         """
-        return StandardizedResponse.error(
-            error=message,
-            error_code="UNAUTHORIZED",
-            status_code=status.HTTP_401_UNAUTHORIZED
-        )
+        return _static_error(message, "UNAUTHORIZED", status.HTTP_401_UNAUTHORIZED)
 
     @staticmethod
     def forbidden(
         message: str = "Permission denied"
-    ) -> Response:
+    ) -> HttpResponse:
         """
         Create a standardized forbidden response
 
@@ -166,11 +342,7 @@ class StandardizedResponse:
         Returns:
             Response object with forbidden format
         """
-        return StandardizedResponse.error(
-            error=message,
-            error_code="FORBIDDEN",
-            status_code=status.HTTP_403_FORBIDDEN
-        )
+        return _static_error(message, "FORBIDDEN", status.HTTP_403_FORBIDDEN)
 
     @staticmethod
     def rate_limit_exceeded(
@@ -222,7 +394,7 @@ class StandardizedResponse:
         if error_id:
             details['error_id'] = error_id
 
-        logger.error(f"Server Error: {message} (ID: {error_id})")
+        logger.error("Server Error: %s (ID: %s)", message, error_id)
 
         return StandardizedResponse.error(
             error=message,
@@ -232,37 +404,164 @@ class StandardizedResponse:
         )
 
 
+class FastCountPaginator(Paginator):
+    """
+    Paginator that never counts more than COUNT_LIMIT rows
+
+    Unfiltered querysets use the planner's row estimate from pg_class (summed
+    over partitions). Filtered ones run a COUNT over at most COUNT_LIMIT + 1
+    rows, so deep pages of huge results stop at that limit.
+    """
+
+    COUNT_LIMIT = 10000
+
+    # True when count is an estimate or a lower bound
+    count_is_estimate = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet):
+            return super().count
+
+        query = queryset.query
+        if not query.where and not query.distinct and not query.is_sliced:
+            estimate = self._estimate_rows(queryset)
+            if estimate > self.COUNT_LIMIT:
+                self.count_is_estimate = True
+                return estimate
+
+        count = queryset.order_by()[:self.COUNT_LIMIT + 1].count()
+        if count > self.COUNT_LIMIT:
+            self.count_is_estimate = True
+        return count
+
+    def _estimate_rows(self, queryset):
+        """Get the planner's row estimate for the queryset's table"""
+        table = queryset.model._meta.db_table
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT COALESCE(SUM(GREATEST(reltuples, 0)), 0)::bigint
+                FROM pg_class
+                WHERE oid = %s::regclass
+                   OR oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = %s::regclass)
+                """,
+                [table, table]
+            )
+            return cursor.fetchone()[0]
+
+
 class EnhancedPageNumberPagination(PageNumberPagination):
     """Enhanced pagination with standardized response format"""
 
+    django_paginator_class = FastCountPaginator
     page_size = 20
     page_size_query_param = 'page_size'
     max_page_size = 100
 
+    def paginate_queryset(self, queryset, request, view=None):
+        self._link_base = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def _get_page_link(self, page_number):
+        """Build a page link from the request URL, parsed once per request"""
+        if self._link_base is None:
+            base = remove_query_param(
+                self.request.build_absolute_uri(), self.page_query_param
+            )
+            self._link_base = (base, '&' if '?' in base else '?')
+
+        base, separator = self._link_base
+        if page_number == 1:
+            return base
+        return f'{base}{separator}{self.page_query_param}={page_number}'
+
+    def get_next_link(self):
+        if not self.page.has_next():
+            return None
+        return self._get_page_link(self.page.next_page_number())
+
+    def get_previous_link(self):
+        if not self.page.has_previous():
+            return None
+        return self._get_page_link(self.page.previous_page_number())
+
+    def get_pagination_meta(self):
+        """Get the pagination metadata for the current page"""
+        page = self.page
+        paginator = page.paginator
+        # count first: it sets count_is_estimate and num_pages depends on it
+        count = paginator.count
+        has_next = page.has_next()
+        has_previous = page.has_previous()
+
+        return {
+            'pagination': {
+                'page': page.number,
+                'pages': paginator.num_pages,
+                'page_size': paginator.per_page,
+                'count': count,
+                'count_is_estimate': paginator.count_is_estimate,
+                'has_next': has_next,
+                'has_previous': has_previous,
+                'next': self._get_page_link(page.number + 1) if has_next else None,
+                'previous': self._get_page_link(page.number - 1) if has_previous else None,
+            }
+        }
+
     def get_paginated_response(self, data):
         """Return paginated response in standardized format"""
-        return StandardizedResponse.success(
+        respond = StandardizedResponse.success
+        if isinstance(data, list) and len(data) > STREAM_THRESHOLD:
+            respond = StandardizedResponse.stream_success
+
+        return respond(
             data=data,
             message="Data retrieved successfully",
-            meta={
-                'pagination': {
-                    'page': self.page.number,
-                    'pages': self.page.paginator.num_pages,
-                    'page_size': self.page_size,
-                    'count': self.page.paginator.count,
-                    'has_next': self.page.has_next(),
-                    'has_previous': self.page.has_previous(),
-                    'next': self.get_next_link(),
-                    'previous': self.get_previous_link(),
-                }
+            meta=self.get_pagination_meta()
+        )
+
+
+class AuditLogCursorPagination(CursorPagination):
+    """
+    Keyset pagination for the audit log
+
+    Pages seek on the (timestamp, id) index instead of scanning and
+    discarding OFFSET rows, so deep pages cost the same as the first one.
+    """
+
+    ordering = ('-timestamp', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def get_pagination_meta(self):
+        """Get the pagination metadata for the current page"""
+        return {
+            'pagination': {
+                'page_size': self.page_size,
+                'has_next': self.has_next,
+                'has_previous': self.has_previous,
+                'next': self.get_next_link(),
+                'previous': self.get_previous_link(),
             }
+        }
+
+    def get_paginated_response(self, data):
+        """Return paginated response in standardized format"""
+        return StandardizedResponse.success(
+            data=data,
+            message="Data retrieved successfully",
+            meta=self.get_pagination_meta()
         )
 
 
 def paginate_queryset(
     queryset: QuerySet,
     page_number: int = 1,
-    page_size: int = 20
+    page_size: int = 20,
+    fields: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """
     Helper function to paginate a queryset
@@ -271,10 +570,13 @@ def paginate_queryset(
         queryset: Django QuerySet to paginate
         page_number: Page number to retrieve
         page_size: Number of items per page
+        fields: Columns to fetch (e.g. from a ``?fields=`` parameter); all
+            columns when omitted
 
     Returns:
         Dictionary with paginated data and metadata
     """
+    fields = fields or []
     paginator = Paginator(queryset, page_size)
 
     try:
@@ -283,7 +585,8 @@ def paginate_queryset(
         page = paginator.page(1)
 
     return {
-        'data': list(page.object_list.values()) if hasattr(page.object_list, 'values') else list(page.object_list),
+        # values(*fields) selects only the requested columns
+        'data': list(page.object_list.values(*fields)) if hasattr(page.object_list, 'values') else list(page.object_list),
         'pagination': {
             'page': page.number,
             'pages': paginator.num_pages,
@@ -5,14 +5,16 @@ import hashlib
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, Q
 from django.utils import timezone
 from .models import (
     UserProfile, Campaign, SourceSite, APIAuditLog, SystemMetrics
 )
 from .validators import (
     validate_content_length, validate_tags_list, validate_url_list,
-    validate_css_selectors, validate_metadata_structure
+    validate_css_selectors, validate_metadata_structure, get_invalid_platforms
 )
+from .renderers import raw_json
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -36,10 +38,112 @@ class UserSerializer(serializers.ModelSerializer):
         return data
 
 
+# User columns NestedUserField never renders
+NESTED_USER_DEFERRED_FIELDS = (
+    'password', 'last_login', 'is_superuser', 'is_staff', 'is_active'
+)
+
+
+class NestedUserField(serializers.Field):
+    """
+    Read-only nested user, rendered with UserSerializer once per request
+
+    Rows in a page usually share a handful of owners, so each user's
+    representation is cached on the request and looked up by the foreign
+    key id without touching the related object.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        user_id = getattr(instance, f'{self.source}_id', serializers.empty)
+        if user_id is None:
+            return None
+
+        request = self.context.get('request')
+        users = None
+        if request is not None:
+            users = getattr(request, '_serialized_users', None)
+            if users is None:
+                users = request._serialized_users = {}
+            if user_id in users:
+                return users[user_id]
+
+        user = super().get_attribute(instance)
+        if user is None:
+            return None
+
+        data = UserSerializer(user, context=self.context).data
+        if users is not None:
+            users[user.pk] = data
+        return data
+
+    def to_representation(self, value):
+        # get_attribute already returns the serialized user
+        return value
+
+
+# (select_related() paths, deferred related columns) per serializer class
+_EAGER_LOADING = {}
+
+
+def _get_eager_loading(serializer_class):
+    loading = _EAGER_LOADING.get(serializer_class)
+    if loading is None:
+        paths, deferred = [], []
+        _collect_select_related(serializer_class, '', paths, deferred)
+        loading = _EAGER_LOADING[serializer_class] = (tuple(paths), tuple(deferred))
+    return loading
+
+
+def get_select_related(serializer_class):
+    """
+    Get the select_related() paths a serializer's nested fields need
+
+    Walks nested users and nested model serializers whose source is a
+    forward foreign key, so list views load them in the same query.
+    """
+    return _get_eager_loading(serializer_class)[0]
+
+
+def get_deferred_fields(serializer_class):
+    """
+    Get the columns of select_related() rows the serializer never reads
+
+    Pass to defer() alongside get_select_related(), e.g. so joined users
+    don't bring their password hash and flags along.
+    """
+    return _get_eager_loading(serializer_class)[1]
+
+
+def _collect_select_related(serializer_class, prefix, paths, deferred):
+    model = serializer_class.Meta.model
+    # Nested fields are always declared, so the field list needn't be built
+    for name, field in serializer_class._declared_fields.items():
+        if not isinstance(field, (NestedUserField, serializers.ModelSerializer)):
+            continue
+        source = field.source or name
+        try:
+            model_field = model._meta.get_field(source)
+        except Exception:
+            continue
+        if not (model_field.many_to_one or model_field.one_to_one) or not model_field.concrete:
+            continue
+
+        path = f'{prefix}{source}'
+        paths.append(path)
+        if isinstance(field, NestedUserField):
+            deferred.extend(f'{path}__{column}' for column in NESTED_USER_DEFERRED_FIELDS)
+        else:
+            _collect_select_related(type(field), f'{path}__', paths, deferred)
+
+
 class UserProfileSerializer(serializers.ModelSerializer):
     """Enhanced user profile serializer with quota management"""
 
-    user = UserSerializer(read_only=True)
+    user = NestedUserField()
     api_usage_percentage = serializers.SerializerMethodField()
     can_make_api_call = serializers.SerializerMethodField()
 
@@ -60,11 +164,24 @@ class UserProfileSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
 
+    def get_current_usage(self, obj):
+        """Get the profile's current usage, read once per request"""
+        request = self.context.get('request')
+        if request is None:
+            return obj.get_current_usage()
+
+        usage = getattr(request, '_quota_usage', None)
+        if usage is None:
+            usage = request._quota_usage = {}
+        if obj.user_id not in usage:
+            usage[obj.user_id] = obj.get_current_usage()
+        return usage[obj.user_id]
+
     def get_api_usage_percentage(self, obj):
-        return obj.get_api_usage_percentage()
+        return obj.get_api_usage_percentage(self.get_current_usage(obj))
 
     def get_can_make_api_call(self, obj):
-        return obj.can_make_api_call()
+        return obj.can_make_api_call(self.get_current_usage(obj))
 
     def validate_preferences(self, value):
         """Validate preferences JSON structure"""
@@ -75,7 +192,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
 class CampaignSerializer(serializers.ModelSerializer):
     """Enhanced campaign serializer with metrics"""
 
-    owner = UserSerializer(read_only=True)
+    owner = NestedUserField()
     content_count = serializers.SerializerMethodField()
     published_content_count = serializers.SerializerMethodField()
 
@@ -91,6 +208,16 @@ class CampaignSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'owner', 'created_at', 'updated_at']
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load the content counts in the same query as the campaigns"""
+        return queryset.annotate(
+            _content_count=Count('content_pieces'),
+            _published_count=Count(
+                'content_pieces', filter=Q(content_pieces__status='published')
+            ),
+        )
+
     def get_content_count(self, obj):
         return obj.get_content_count()
 
@@ -102,10 +229,9 @@ class CampaignSerializer(serializers.ModelSerializer):
         if not isinstance(value, list):
             raise serializers.ValidationError("Target platforms must be a list.")
 
-        valid_platforms = ['facebook', 'instagram', 'twitter', 'linkedin', 'youtube', 'tiktok', 'wordpress', 'email', 'other']
-        for platform in value:
-            if platform not in valid_platforms:
-                raise serializers.ValidationError(f"Invalid platform: {platform}")
+        invalid = get_invalid_platforms(value)
+        if invalid:
+            raise serializers.ValidationError(f"Invalid platforms: {', '.join(invalid)}")
 
         return value
 
@@ -131,8 +257,9 @@ class CampaignSerializer(serializers.ModelSerializer):
 class SourceSiteSerializer(serializers.ModelSerializer):
     """Enhanced source site serializer with monitoring metrics"""
 
-    owner = UserSerializer(read_only=True)
-    success_rate = serializers.SerializerMethodField()
+    owner = NestedUserField()
+    # Stored column computed by Postgres
+    success_rate = serializers.FloatField(read_only=True)
 
     class Meta:
         model = SourceSite
@@ -152,9 +279,6 @@ class SourceSiteSerializer(serializers.ModelSerializer):
             'last_error', 'error_count', 'created_at', 'updated_at'
         ]
 
-    def get_success_rate(self, obj):
-        return obj.get_success_rate()
-
     def validate_content_selectors(self, value):
         """Validate CSS selectors structure"""
         validate_css_selectors(value)
@@ -179,10 +303,38 @@ class SourceSiteSerializer(serializers.ModelSerializer):
         return value
 
 
+class RawJSONField(serializers.JSONField):
+    """
+    Read-only JSON field that passes the database's JSON text through
+
+    When the queryset annotates ``_<field>_json`` with the column cast to
+    text, the value is embedded in the response as-is instead of being
+    decoded into Python objects and encoded again by the renderer.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        raw = getattr(instance, f'_{self.source}_json', serializers.empty)
+        if raw is serializers.empty:
+            return super().get_attribute(instance)
+        return None if raw is None else raw_json(raw)
+
+
+# Audit log fields hidden from regular users
+AUDIT_LOG_SENSITIVE_FIELDS = frozenset((
+    'request_headers', 'ip_address', 'session_id', 'additional_data'
+))
+
+
 class APIAuditLogSerializer(serializers.ModelSerializer):
     """Read-only serializer for API audit logs"""
 
-    user = UserSerializer(read_only=True)
+    user = NestedUserField()
+    request_headers = RawJSONField()
+    additional_data = RawJSONField()
 
     class Meta:
         model = APIAuditLog
@@ -196,21 +348,27 @@ class APIAuditLogSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = '__all__'
 
+    # Fields regular users may see on their own logs
+    nonstaff_fields = frozenset(Meta.fields) - AUDIT_LOG_SENSITIVE_FIELDS
+
     def to_representation(self, instance):
         """Filter sensitive data based on user permissions"""
-        data = super().to_representation(instance)
         request = self.context.get('request')
+        restricted = (
+            request is not None and hasattr(request, 'user')
+            and not request.user.is_staff
+        )
 
-        if request and hasattr(request, 'user'):
-            # Non-staff users can only see their own logs and limited fields
-            if not request.user.is_staff:
-                if instance.user != request.user:
-                    return {}  # Hide logs from other users
+        # Non-staff users can only see their own logs; skip serializing others
+        if restricted and instance.user_id != request.user.id:
+            return {}  # Hide logs from other users
 
-                # Remove sensitive fields for regular users
-                sensitive_fields = ['request_headers', 'ip_address', 'session_id', 'additional_data']
-                for field in sensitive_fields:
-                    data.pop(field, None)
+        data = super().to_representation(instance)
+
+        if restricted:
+            # Keep only the non-sensitive fields for regular users
+            allowed = self.nonstaff_fields
+            return {key: value for key, value in data.items() if key in allowed}
 
         return data
 
@@ -248,6 +406,27 @@ class TimestampMixin:
         return timezone.now()
 
 
+# (field name, model method, omit when empty)
+COMPUTED_FIELDS = (
+    ('word_count', 'get_word_count', False),
+    ('processing_duration_seconds', 'get_processing_duration', True),
+)
+
+# Computed fields resolved per model class, shared across serializer instances
+_COMPUTED_FIELDS = {}
+
+
+def get_computed_fields(model):
+    """Get the computed fields the model provides a method for"""
+    fields = _COMPUTED_FIELDS.get(model)
+    if fields is None:
+        fields = tuple(
+            field for field in COMPUTED_FIELDS if hasattr(model, field[1])
+        )
+        _COMPUTED_FIELDS[model] = fields
+    return fields
+
+
 class BaseEnhancedSerializer(serializers.ModelSerializer, ContentHashMixin, TimestampMixin):
     """Base serializer with common enhancements"""
 
@@ -255,7 +434,13 @@ class BaseEnhancedSerializer(serializers.ModelSerializer, ContentHashMixin, Time
         """Base validation with common checks"""
         # Add content hash if content field exists
         if 'content' in data and hasattr(self.Meta.model, 'content_hash'):
-            data['content_hash'] = self.create_content_hash(data['content'])
+            instance = self.instance
+            if (instance is not None and not isinstance(instance, (list, tuple))
+                    and getattr(instance, 'content', None) == data['content']):
+                # Content unchanged on update; the stored hash is still valid
+                data['content_hash'] = instance.content_hash
+            else:
+                data['content_hash'] = self.create_content_hash(data['content'])
 
         return super().validate(data)
 
@@ -264,13 +449,10 @@ class BaseEnhancedSerializer(serializers.ModelSerializer, ContentHashMixin, Time
         data = super().to_representation(instance)
 
         # Add computed fields
-        if hasattr(instance, 'get_word_count'):
-            data['word_count'] = instance.get_word_count()
-
-        if hasattr(instance, 'get_processing_duration'):
-            duration = instance.get_processing_duration()
-            if duration:
-                data['processing_duration_seconds'] = duration
+        for field_name, getter, skip_empty in get_computed_fields(self.Meta.model):
+            value = getattr(instance, getter)()
+            if value or not skip_empty:
+                data[field_name] = value
 
         return data
 
@@ -0,0 +1,75 @@
+"""
+Signals that invalidate cached permission checks and system health data
+"""
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+
+from .models import SystemMetrics
+from .permissions import perm_cache_key
+
+PERMISSION_ACTIONS = ('post_add', 'post_remove', 'post_clear')
+
+
+def invalidate_user_perms(user_ids):
+    """Drop every cached has_perm result for the given users"""
+    codenames = [
+        f'{app_label}.{codename}'
+        for app_label, codename in Permission.objects.values_list(
+            'content_type__app_label', 'codename'
+        )
+    ]
+    cache.delete_many([
+        perm_cache_key(user_id, codename)
+        for user_id in user_ids
+        for codename in codenames
+    ])
+
+
+@receiver(m2m_changed, sender=User.user_permissions.through)
+@receiver(m2m_changed, sender=User.groups.through)
+def user_permissions_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """User permissions or group membership changed"""
+    if isinstance(instance, User):
+        if action in PERMISSION_ACTIONS:
+            invalidate_user_perms([instance.pk])
+        return
+
+    # Reverse side, e.g. group.user_set.add(...) or permission.user_set.clear().
+    # post_clear carries no pk_set and the rows are gone by then, so the
+    # affected users are collected on pre_clear
+    if action == 'pre_clear':
+        instance._cleared_user_ids = list(instance.user_set.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        invalidate_user_perms(instance.__dict__.pop('_cleared_user_ids', []))
+    elif action in PERMISSION_ACTIONS and pk_set:
+        invalidate_user_perms(pk_set)
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def group_permissions_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Permissions granted to a group changed"""
+    if isinstance(instance, Group):
+        if action in PERMISSION_ACTIONS:
+            invalidate_user_perms(_group_user_ids([instance.pk]))
+        return
+
+    # Reverse side, permission.group_set; see user_permissions_changed
+    if action == 'pre_clear':
+        instance._cleared_user_ids = list(_group_user_ids(instance.group_set.all()))
+    elif action == 'post_clear':
+        invalidate_user_perms(instance.__dict__.pop('_cleared_user_ids', []))
+    elif action in PERMISSION_ACTIONS and pk_set:
+        invalidate_user_perms(_group_user_ids(pk_set))
+
+
+def _group_user_ids(groups):
+    return User.objects.filter(groups__in=groups).values_list('pk', flat=True).distinct()
+
+
+@receiver(post_save, sender=SystemMetrics)
+def system_metrics_saved(sender, instance, **kwargs):
+    """New metrics make the cached system health stale"""
+    from .views import SYSTEM_HEALTH_CACHE_KEY
+    cache.delete(SYSTEM_HEALTH_CACHE_KEY)
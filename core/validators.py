@@ -1,7 +1,49 @@
+import json
+import math
 import re
+import string
+from json.encoder import encode_basestring_ascii
+
+import numpy as np
 from django.core.exceptions import ValidationError
+from django.core.validators import URLValidator
 from django.utils.translation import gettext as _
 
+VALID_PLATFORMS = frozenset((
+    'facebook', 'instagram', 'twitter', 'linkedin', 'youtube',
+    'tiktok', 'wordpress', 'email', 'other'
+))
+VALID_PLATFORMS_TEXT = ', '.join(sorted(VALID_PLATFORMS))
+
+URL_VALIDATOR = URLValidator()
+
+# Matched with fullmatch(), so the patterns need no anchors
+TAG_RE = re.compile(r'[a-zA-Z0-9\-_\s]+')
+CSS_SELECTOR_RE = re.compile(r'[a-zA-Z0-9\-_\.\#\[\]=":,\s>+~\(\)]+')
+
+# Password character classes
+UPPERCASE_CHARS = frozenset(string.ascii_uppercase)
+LOWERCASE_CHARS = frozenset(string.ascii_lowercase)
+SPECIAL_CHARS = frozenset('!@#$%^&*(),.?":{}|<>')
+
+# Common API key patterns
+API_KEY_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'^sk-[a-zA-Z0-9]{48,}$',  # OpenAI style
+    r'^AIza[a-zA-Z0-9_-]{35}$',  # Google API key style
+    r'^[a-fA-F0-9]{32,64}$',  # Generic hex key
+    r'^[a-zA-Z0-9_-]{20,100}$',  # Generic base64-like key
+))
+
+# Potentially harmful prompt content, matched in a single scan
+HARMFUL_PROMPT_RE = re.compile(
+    r'\b(?:'
+    r'nude|naked|sexual|explicit'
+    r'|violence|violent|kill|murder'
+    r'|hack|exploit|malware'
+    r')\b',
+    re.IGNORECASE
+)
+
 
 class ComplexPasswordValidator:
     """
@@ -13,22 +55,38 @@ class ComplexPasswordValidator:
     """
 
     def validate(self, password, user=None):
-        if not re.search(r'[A-Z]', password):
+        # Classify every character in one pass
+        has_upper = has_lower = has_digit = has_special = False
+        for char in password:
+            if char in UPPERCASE_CHARS:
+                has_upper = True
+            elif char in LOWERCASE_CHARS:
+                has_lower = True
+            elif char.isdecimal():
+                has_digit = True
+            elif char in SPECIAL_CHARS:
+                has_special = True
+            else:
+                continue
+            if has_upper and has_lower and has_digit and has_special:
+                break
+
+        if not has_upper:
             raise ValidationError(
                 _("Password must contain at least one uppercase letter."),
                 code='password_no_upper',
             )
-        if not re.search(r'[a-z]', password):
+        if not has_lower:
             raise ValidationError(
                 _("Password must contain at least one lowercase letter."),
                 code='password_no_lower',
             )
-        if not re.search(r'\d', password):
+        if not has_digit:
             raise ValidationError(
                 _("Password must contain at least one digit."),
                 code='password_no_digit',
             )
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+        if not has_special:
             raise ValidationError(
                 _("Password must contain at least one special character (!@#$%^&*(),.?\":{}|<>)."),
                 code='password_no_special',
@@ -57,12 +115,9 @@ def validate_url_list(value):
     if not isinstance(value, list):
         raise ValidationError("Value must be a list.")
 
-    from django.core.validators import URLValidator
-    url_validator = URLValidator()
-
     for i, url in enumerate(value):
         try:
-            url_validator(url)
+            URL_VALIDATOR(url)
         except ValidationError:
             raise ValidationError(f"Invalid URL at position {i}: {url}")
 
@@ -72,11 +127,17 @@ def validate_platform_list(value):
     if not isinstance(value, list):
         raise ValidationError("Value must be a list.")
 
-    valid_platforms = ['facebook', 'instagram', 'twitter', 'linkedin', 'youtube', 'tiktok', 'wordpress', 'email', 'other']
+    invalid = get_invalid_platforms(value)
+    if invalid:
+        raise ValidationError(f"Invalid platforms: {', '.join(invalid)}. Valid options: {VALID_PLATFORMS_TEXT}")
 
-    for platform in value:
-        if platform not in valid_platforms:
-            raise ValidationError(f"Invalid platform: {platform}. Valid options: {', '.join(valid_platforms)}")
+
+def get_invalid_platforms(value):
+    """Get the entries of a platform list that are not valid platforms"""
+    return [
+        str(platform) for platform in value
+        if not isinstance(platform, str) or platform not in VALID_PLATFORMS
+    ]
 
 
 def validate_css_selectors(value):
@@ -84,14 +145,12 @@ def validate_css_selectors(value):
     if not isinstance(value, dict):
         raise ValidationError("CSS selectors must be a dictionary.")
 
-    # Basic validation for common CSS selector patterns
-    css_pattern = re.compile(r'^[a-zA-Z0-9\-_\.\#\[\]=":,\s>+~\(\)]+$')
-
     for key, selector in value.items():
         if not isinstance(selector, str):
             raise ValidationError(f"Selector for '{key}' must be a string.")
 
-        if not css_pattern.match(selector):
+        # Basic validation for common CSS selector patterns
+        if not CSS_SELECTOR_RE.fullmatch(selector):
             raise ValidationError(f"Invalid CSS selector for '{key}': {selector}")
 
 
@@ -100,18 +159,15 @@ def validate_api_key_format(value):
     if not isinstance(value, str):
         raise ValidationError("API key must be a string.")
 
-    # Common API key patterns
-    patterns = [
-        r'^sk-[a-zA-Z0-9]{48,}$',  # OpenAI style
-        r'^AIza[a-zA-Z0-9_-]{35}$',  # Google API key style
-        r'^[a-fA-F0-9]{32,64}$',  # Generic hex key
-        r'^[a-zA-Z0-9_-]{20,100}$',  # Generic base64-like key
-    ]
-
-    if not any(re.match(pattern, value) for pattern in patterns):
+    if not is_valid_api_key_format(value):
         raise ValidationError("Invalid API key format.")
 
 
+def is_valid_api_key_format(value):
+    """Check an API key against the known patterns"""
+    return any(pattern.match(value) for pattern in API_KEY_PATTERNS)
+
+
 def validate_image_dimensions(width, height):
     """Validate image dimensions"""
     if width < 100 or height < 100:
@@ -144,10 +200,14 @@ def validate_image_dimensions(width, height):
 
 def validate_content_length(value, min_length=10, max_length=50000):
     """Validate content length"""
-    if len(value) < min_length:
+    if not isinstance(value, str):
+        raise ValidationError("Content must be a string.")
+
+    length = len(value)
+    if length < min_length:
         raise ValidationError(f"Content must be at least {min_length} characters long.")
 
-    if len(value) > max_length:
+    if length > max_length:
         raise ValidationError(f"Content cannot exceed {max_length} characters.")
 
 
@@ -169,7 +229,7 @@ def validate_tags_list(value):
         if len(tag) > 50:
             raise ValidationError("Tags cannot exceed 50 characters.")
 
-        if not re.match(r'^[a-zA-Z0-9\-_\s]+$', tag):
+        if not TAG_RE.fullmatch(tag):
             raise ValidationError(f"Invalid tag format: {tag}. Only letters, numbers, hyphens, underscores, and spaces allowed.")
 
 
@@ -185,15 +245,8 @@ def validate_prompt_content(value):
         raise ValidationError("Prompt cannot exceed 4000 characters.")
 
     # Check for potentially harmful content
-    harmful_patterns = [
-        r'\b(nude|naked|sexual|explicit)\b',
-        r'\b(violence|violent|kill|murder)\b',
-        r'\b(hack|exploit|malware)\b',
-    ]
-
-    for pattern in harmful_patterns:
-        if re.search(pattern, value, re.IGNORECASE):
-            raise ValidationError("Prompt contains potentially harmful content.")
+    if HARMFUL_PROMPT_RE.search(value):
+        raise ValidationError("Prompt contains potentially harmful content.")
 
 
 def validate_embedding_vector(value):
@@ -204,36 +257,76 @@ def validate_embedding_vector(value):
     if len(value) not in [768, 1536, 3072]:  # Common embedding dimensions
         raise ValidationError("Embedding vector must be 768, 1536, or 3072 dimensions.")
 
+    # Fast path: one vectorized check over a numeric array
+    try:
+        vector = np.asarray(value)
+    except ValueError:  # Ragged nested lists
+        vector = None
+    if vector is not None and vector.ndim == 1 and vector.dtype.kind in 'biuf':
+        # Reasonable bounds for normalized embeddings; NaN fails the check
+        if (np.abs(vector) <= 10).all():
+            return
+
+    # Slow path only to report the first offending value
     for i, val in enumerate(value):
         if not isinstance(val, (int, float)):
             raise ValidationError(f"Embedding vector value at position {i} must be a number.")
 
-        if abs(val) > 10:  # Reasonable bounds for normalized embeddings
+        # Reasonable bounds for normalized embeddings; also rejects NaN
+        if not abs(val) <= 10:
             raise ValidationError(f"Embedding vector value at position {i} is out of bounds: {val}")
 
 
+METADATA_MAX_SIZE = 10000  # 10KB, as serialized by json.dumps()
+METADATA_MAX_DEPTH = 5
+
+
+def _json_scalar_length(value):
+    """Length of a scalar as json.dumps() would serialize it"""
+    if isinstance(value, str):
+        return len(encode_basestring_ascii(value))
+    if value is None or value is True:
+        return 4
+    if value is False:
+        return 5
+    if isinstance(value, int):
+        return len(int.__repr__(value))
+    if isinstance(value, float):
+        if value != value:
+            return 3  # NaN
+        if value in (math.inf, -math.inf):
+            return 8 if value > 0 else 9  # Infinity / -Infinity
+        return len(float.__repr__(value))
+    return len(json.dumps(value))
+
+
 def validate_metadata_structure(value):
     """Validate metadata JSON structure"""
     if not isinstance(value, dict):
         raise ValidationError("Metadata must be a JSON object (dictionary).")
 
-    # Limit metadata size
-    import json
-    if len(json.dumps(value)) > 10000:  # 10KB limit
-        raise ValidationError("Metadata size cannot exceed 10KB.")
-
-    # Validate nested structure depth
-    def check_depth(obj, depth=0, max_depth=5):
-        if depth > max_depth:
+    # Walk the structure once, checking depth and key types while summing
+    # the serialized size, and stop as soon as a limit is exceeded
+    size = 0
+    stack = [(value, 0)]
+    while stack:
+        obj, depth = stack.pop()
+        if depth > METADATA_MAX_DEPTH:
             raise ValidationError("Metadata nesting too deep (max 5 levels).")
 
         if isinstance(obj, dict):
+            # Braces, plus ", " between and ": " within items
+            size += 2 + 4 * len(obj) - (2 if obj else 0)
             for key, val in obj.items():
                 if not isinstance(key, str):
                     raise ValidationError("All metadata keys must be strings.")
-                check_depth(val, depth + 1, max_depth)
-        elif isinstance(obj, list):
-            for item in obj:
-                check_depth(item, depth + 1, max_depth)
-
-    check_depth(value)
\ No newline at end of file
+                size += len(encode_basestring_ascii(key))
+                stack.append((val, depth + 1))
+        elif isinstance(obj, (list, tuple)):
+            size += 2 + 2 * len(obj) - (2 if obj else 0)
+            stack.extend((item, depth + 1) for item in obj)
+        else:
+            size += _json_scalar_length(obj)
+
+        if size > METADATA_MAX_SIZE:
+            raise ValidationError("Metadata size cannot exceed 10KB.")
@@ -3,25 +3,45 @@ Enhanced views with security, performance, and standardized responses
 """
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.response import Response
-from django.contrib.auth.models import User
-from django.db.models import Q
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, TextField
+from django.db.models.functions import Cast, Coalesce
 from django.utils import timezone
 from django.core.cache import cache
-from django.db import transaction
 from datetime import timedelta
 
-from .models import UserProfile, Campaign, SourceSite, APIAuditLog, SystemMetrics
+from .models import (
+    UserProfile, Campaign, SourceSite, APIAuditLog, SystemMetrics, DailyAPIMetrics
+)
 from .serializers import (
     UserProfileSerializer, CampaignSerializer, SourceSiteSerializer,
-    APIAuditLogSerializer, SystemMetricsSerializer
+    APIAuditLogSerializer, get_select_related, get_deferred_fields
 )
 from .permissions import (
-    EnhancedGlobalPermission, IsOwnerOrReadOnly, IsPremiumUser,
-    APIQuotaPermission, SecureResourceAccess
+    EnhancedGlobalPermission, IsOwnerOrReadOnly,
+    APIQuotaPermission, SecureResourceAccess, annotate_ownership
+)
+from .responses import (
+    StandardizedResponse, EnhancedPageNumberPagination, AuditLogCursorPagination
 )
-from .responses import StandardizedResponse, EnhancedPageNumberPagination
-from .middleware import APIAuditMiddleware
+
+
+SYSTEM_HEALTH_CACHE_KEY = 'system_health'
+SYSTEM_HEALTH_CACHE_TIMEOUT = 60  # seconds
+
+
+def related_count(model, relation, **filters):
+    """
+    Count rows of a reverse relation as a correlated subquery
+
+    Unlike Count() over a join, several of these can be annotated on one
+    queryset without multiplying each other's rows.
+    """
+    field = model._meta.get_field(relation)
+    fk_name = field.field.name
+    counts = field.related_model.objects.filter(
+        **{fk_name: OuterRef('pk')}, **filters
+    ).order_by().values(fk_name).annotate(n=Count('pk')).values('n')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
 
 
 class BaseSecureView(generics.GenericAPIView):
@@ -43,15 +63,41 @@ class BaseSecureView(generics.GenericAPIView):
                 return StandardizedResponse.error(str(exc.detail))
         return StandardizedResponse.server_error()
 
+    def filter_queryset(self, queryset):
+        """Load nested relations and resolve object ownership in the same query"""
+        queryset = super().filter_queryset(queryset)
+        serializer_class = self.get_serializer_class()
+        related = get_select_related(serializer_class)
+        if related:
+            queryset = queryset.select_related(*related).defer(
+                *get_deferred_fields(serializer_class)
+            )
+        if self.request.user.is_authenticated:
+            queryset = annotate_ownership(queryset, self.request.user)
+        return queryset
+
     def get_queryset(self):
         """Base queryset with user filtering"""
         queryset = super().get_queryset()
-        if hasattr(self.model, 'owner'):
-            queryset = queryset.filter(owner=self.request.user)
-        elif hasattr(self.model, 'creator'):
-            queryset = queryset.filter(creator=self.request.user)
+        owner_field = self._get_owner_field()
+        if owner_field is not None:
+            queryset = queryset.filter(**{owner_field: self.request.user})
         return queryset
 
+    @classmethod
+    def _get_owner_field(cls):
+        """Get the field that ties the view's model to a user"""
+        # Static per view class; memoize on the class itself
+        if '_owner_field' not in cls.__dict__:
+            model = getattr(cls, 'model', None)
+            if hasattr(model, 'owner'):
+                cls._owner_field = 'owner'
+            elif hasattr(model, 'creator'):
+                cls._owner_field = 'creator'
+            else:
+                cls._owner_field = None
+        return cls._owner_field
+
 
 class UserProfileView(BaseSecureView):
     """Enhanced user profile management"""
@@ -102,7 +148,9 @@ class CampaignListCreateView(BaseSecureView, generics.ListCreateAPIView):
 
     def get_queryset(self):
         """Get campaigns for current user with optional filtering"""
-        queryset = Campaign.objects.filter(owner=self.request.user)
+        queryset = CampaignSerializer.setup_eager_loading(
+            Campaign.objects.filter(owner=self.request.user)
+        )
 
         # Filter by status
         status_filter = self.request.query_params.get('status')
@@ -114,6 +162,15 @@ class CampaignListCreateView(BaseSecureView, generics.ListCreateAPIView):
         if is_active is not None:
             queryset = queryset.filter(is_active=is_active.lower() == 'true')
 
+        # Filter by tag / platform (containment, so the GIN indexes apply)
+        tag = self.request.query_params.get('tag')
+        if tag:
+            queryset = queryset.filter(tags__contains=[tag])
+
+        platform = self.request.query_params.get('platform')
+        if platform:
+            queryset = queryset.filter(target_platforms__contains=[platform])
+
         # Search by name
         search = self.request.query_params.get('search')
         if search:
@@ -148,12 +205,9 @@ class CampaignListCreateView(BaseSecureView, generics.ListCreateAPIView):
             serializer = self.get_serializer(data=request.data)
 
             if serializer.is_valid():
-                with transaction.atomic():
-                    campaign = serializer.save(owner=request.user)
-
-                    # Update user profile stats
-                    profile = request.user.profile
-                    profile.save()
+                campaign = serializer.save(owner=request.user)
+                # A new campaign has no content yet; skip counting it
+                campaign._content_count = campaign._published_count = 0
 
                 return StandardizedResponse.success(
                     data=self.get_serializer(campaign).data,
@@ -175,7 +229,18 @@ class CampaignDetailView(BaseSecureView, generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [EnhancedGlobalPermission, IsOwnerOrReadOnly]
 
     def get_queryset(self):
-        return Campaign.objects.filter(owner=self.request.user)
+        queryset = CampaignSerializer.setup_eager_loading(
+            Campaign.objects.filter(owner=self.request.user)
+        )
+        if self.request.method in ('GET', 'HEAD'):
+            # Detail metrics for retrieve(), which also answers HEAD, counted in the same query as the campaign
+            queryset = queryset.annotate(
+                _is_published_count=related_count(Campaign, 'content_pieces', is_published=True),
+                _scheduled_count=related_count(Campaign, 'content_pieces', status='scheduled'),
+                _images_count=related_count(Campaign, 'image_requests'),
+                _embeddings_count=related_count(Campaign, 'embeddings'),
+            )
+        return queryset
 
     def retrieve(self, request, pk=None):
         """Get campaign details"""
@@ -186,11 +251,11 @@ class CampaignDetailView(BaseSecureView, generics.RetrieveUpdateDestroyAPIView):
             # Add additional metrics
             data = serializer.data
             data['metrics'] = {
-                'content_pieces_count': campaign.content_pieces.count(),
-                'published_content_count': campaign.content_pieces.filter(is_published=True).count(),
-                'scheduled_content_count': campaign.content_pieces.filter(status='scheduled').count(),
-                'images_generated': campaign.image_requests.count(),
-                'embeddings_count': campaign.embeddings.count(),
+                'content_pieces_count': campaign.get_content_count(),
+                'published_content_count': campaign._is_published_count,
+                'scheduled_content_count': campaign._scheduled_count,
+                'images_generated': campaign._images_count,
+                'embeddings_count': campaign._embeddings_count,
             }
 
             return StandardizedResponse.success(
@@ -246,9 +311,7 @@ class SourceSiteListCreateView(BaseSecureView, generics.ListCreateAPIView):
     model = SourceSite
 
     def get_queryset(self):
-        queryset = SourceSite.objects.filter(
-            Q(owner=self.request.user) | Q(is_public=True)
-        )
+        queryset = SourceSite.objects.filter(Q(owner=self.request.user) | Q(is_public=True))
 
         # Filter by category
         category = self.request.query_params.get('category')
@@ -260,6 +323,11 @@ class SourceSiteListCreateView(BaseSecureView, generics.ListCreateAPIView):
         if is_active is not None:
             queryset = queryset.filter(is_active=is_active.lower() == 'true')
 
+        # Sort by the stored success rate
+        ordering = self.request.query_params.get('ordering')
+        if ordering in ('success_rate', '-success_rate'):
+            return queryset.order_by(ordering, '-created_at')
+
         return queryset.order_by('-created_at')
 
     def create(self, request):
@@ -288,7 +356,8 @@ def dashboard_analytics(request):
     cached_data = cache.get(cache_key)
 
     if cached_data:
-        return StandardizedResponse.success(
+        return StandardizedResponse.conditional_success(
+            request,
             data=cached_data,
             message="Dashboard analytics retrieved successfully (cached)"
         )
@@ -296,29 +365,33 @@ def dashboard_analytics(request):
     try:
         # User metrics
         profile = request.user.profile
+        usage = profile.get_current_usage()
         user_metrics = {
-            'api_usage_percentage': profile.get_api_usage_percentage(),
-            'api_calls_remaining': profile.api_quota - profile.api_usage_current_month,
+            'api_usage_percentage': profile.get_api_usage_percentage(usage),
+            'api_calls_remaining': profile.api_quota - usage,
             'plan_type': profile.plan_type,
             'is_premium': profile.is_premium,
         }
 
+        # Campaign counts, including recent activity (last 7 days), in one query
+        week_ago = timezone.now() - timedelta(days=7)
+        campaign_counts = Campaign.objects.filter(owner=request.user).aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(is_active=True)),
+            recent=Count('id', filter=Q(created_at__gte=week_ago)),
+        )
+
         # Content metrics
-        campaigns = Campaign.objects.filter(owner=request.user)
         content_metrics = {
-            'total_campaigns': campaigns.count(),
-            'active_campaigns': campaigns.filter(is_active=True).count(),
+            'total_campaigns': campaign_counts['total'],
+            'active_campaigns': campaign_counts['active'],
             'total_content_created': profile.total_content_created,
             'total_images_generated': profile.total_images_generated,
             'total_embeddings_created': profile.total_embeddings_created,
         }
 
-        # Recent activity (last 7 days)
-        week_ago = timezone.now() - timedelta(days=7)
-        recent_campaigns = campaigns.filter(created_at__gte=week_ago).count()
-
         recent_activity = {
-            'campaigns_this_week': recent_campaigns,
+            'campaigns_this_week': campaign_counts['recent'],
             'api_calls_this_week': APIAuditLog.objects.filter(
                 user=request.user,
                 timestamp__gte=week_ago
@@ -335,7 +408,8 @@ def dashboard_analytics(request):
         # Cache for 15 minutes
         cache.set(cache_key, analytics_data, 900)
 
-        return StandardizedResponse.success(
+        return StandardizedResponse.conditional_success(
+            request,
             data=analytics_data,
             message="Dashboard analytics retrieved successfully"
         )
@@ -348,6 +422,15 @@ def dashboard_analytics(request):
 @permission_classes([permissions.IsAdminUser])
 def system_health(request):
     """System health check for administrators"""
+    # Same for every administrator; invalidated when SystemMetrics is saved
+    health_data = cache.get(SYSTEM_HEALTH_CACHE_KEY)
+    if health_data is not None:
+        return StandardizedResponse.conditional_success(
+            request,
+            data=health_data,
+            message="System health retrieved successfully"
+        )
+
     try:
         # Get latest system metrics
         latest_metrics = SystemMetrics.objects.order_by('-metrics_date').first()
@@ -358,17 +441,22 @@ def system_health(request):
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE
             )
 
+        # API counters come from the audit log rollup (refreshed hourly)
+        api_metrics = DailyAPIMetrics.objects.filter(day=timezone.localdate()).first()
+        total_calls = api_metrics.total_api_calls if api_metrics else 0
+        successful_calls = api_metrics.successful_api_calls if api_metrics else 0
+
         health_data = {
             'system_status': latest_metrics.system_status,
             'api_health': {
-                'total_calls_today': latest_metrics.total_api_calls_today,
+                'total_calls_today': total_calls,
                 'success_rate': round(
-                    (latest_metrics.successful_api_calls_today / max(latest_metrics.total_api_calls_today, 1)) * 100, 2
+                    (successful_calls / max(total_calls, 1)) * 100, 2
                 ),
-                'avg_response_time': latest_metrics.avg_response_time_ms,
+                'avg_response_time': api_metrics.avg_response_time_ms if api_metrics else None,
             },
             'user_metrics': {
-                'active_users_today': latest_metrics.active_users_today,
+                'active_users_today': api_metrics.active_users if api_metrics else 0,
                 'new_users_today': latest_metrics.new_users_today,
                 'premium_users': latest_metrics.premium_users,
             },
@@ -384,8 +472,10 @@ def system_health(request):
             },
             'last_updated': latest_metrics.updated_at.isoformat()
         }
+        cache.set(SYSTEM_HEALTH_CACHE_KEY, health_data, SYSTEM_HEALTH_CACHE_TIMEOUT)
 
-        return StandardizedResponse.success(
+        return StandardizedResponse.conditional_success(
+            request,
             data=health_data,
             message="System health retrieved successfully"
         )
@@ -399,7 +489,18 @@ def system_health(request):
 def audit_logs(request):
     """Get audit logs for administrators"""
     try:
-        logs = APIAuditLog.objects.all().order_by('-timestamp')
+        # request_body isn't serialized; skip loading (and detoasting) it.
+        # The JSON columns are read as text and embedded in the response
+        # verbatim instead of being decoded and re-encoded.
+        logs = APIAuditLog.objects.select_related(
+            *get_select_related(APIAuditLogSerializer)
+        ).defer(
+            'request_body', 'request_headers', 'additional_data',
+            *get_deferred_fields(APIAuditLogSerializer)
+        ).annotate(
+            _request_headers_json=Cast('request_headers', TextField()),
+            _additional_data_json=Cast('additional_data', TextField()),
+        )
 
         # Apply filters
         user_id = request.query_params.get('user_id')
@@ -414,16 +515,22 @@ def audit_logs(request):
         if status_code:
             logs = logs.filter(response_status=status_code)
 
-        # Paginate results
-        paginator = EnhancedPageNumberPagination()
+        # Paginate results (keyset on timestamp, id)
+        paginator = AuditLogCursorPagination()
         page = paginator.paginate_queryset(logs, request)
 
         if page is not None:
             serializer = APIAuditLogSerializer(page, many=True, context={'request': request})
-            return paginator.get_paginated_response(serializer.data)
+            return StandardizedResponse.conditional_success(
+                request,
+                data=serializer.data,
+                message="Data retrieved successfully",
+                meta=paginator.get_pagination_meta()
+            )
 
-        serializer = APIAuditLogSerializer(logs[:100], many=True, context={'request': request})  # Limit to 100 if no pagination
-        return StandardizedResponse.success(
+        serializer = APIAuditLogSerializer(logs.order_by('-timestamp')[:100], many=True, context={'request': request})  # Limit to 100 if no pagination
+        return StandardizedResponse.conditional_success(
+            request,
             data=serializer.data,
             message="Audit logs retrieved successfully"
         )
@@ -9,3 +9,10 @@ class EmbeddingAdmin(admin.ModelAdmin):
     search_fields = ('title', 'content')
     readonly_fields = ('id', 'created_at', 'updated_at')
     ordering = ['-created_at']
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if request.resolver_match and request.resolver_match.url_name.endswith('_changelist'):
+            # The list never shows the vector or metadata; don't load them
+            queryset = queryset.defer('embedding_vector', 'metadata')
+        return queryset
@@ -0,0 +1,106 @@
+"""
+Model fields for embedding storage
+"""
+import numpy as np
+from django.db import models
+from django.utils.functional import cached_property
+
+# Little-endian float32, 4 bytes per dimension
+VECTOR_DTYPE = np.dtype('<f4')
+
+
+def pack_vector(value):
+    """Pack a sequence of floats into float32 bytes"""
+    return np.asarray(value, dtype=VECTOR_DTYPE).tobytes()
+
+
+def unpack_vector(data):
+    """Unpack float32 bytes into a list of floats"""
+    return np.frombuffer(data, dtype=VECTOR_DTYPE).tolist()
+
+
+class Float32VectorField(models.BinaryField):
+    """
+    Embedding vector stored as packed float32 in a bytea column
+
+    In Python the value is a list of floats, as with the JSONField this
+    replaces, but the column is about a third of the size of the JSON text
+    and decodes with a single numpy call instead of a JSON parse.
+    """
+
+    description = "Vector of float32 values"
+
+    def __init__(self, *args, **kwargs):
+        # BinaryField is not editable by default; vectors are set through the API
+        kwargs.setdefault('editable', True)
+        super().__init__(*args, **kwargs)
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return None
+        return unpack_vector(value)
+
+    def to_python(self, value):
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return unpack_vector(value)
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+        return value
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if value is not None and not isinstance(value, (bytes, bytearray, memoryview)):
+            value = pack_vector(value)
+        return super().get_db_prep_value(value, connection, prepared)
+
+    def value_to_string(self, obj):
+        # Serialized (dumpdata) as a plain list, like the old JSON column
+        return self.value_from_object(obj)
+
+
+class CodedChoiceField(models.PositiveSmallIntegerField):
+    """
+    String choices stored as small integer codes
+
+    Code reads and writes the choice strings, including in filters such as
+    ``origin='webscraping'``; only the column holds the 2-byte codes from
+    ``codes``. Codes are explicit so reordering the choices never changes
+    what stored rows mean.
+    """
+
+    description = "Choice stored as a small integer code"
+
+    def __init__(self, *args, codes=None, **kwargs):
+        self.codes = dict(codes or {})
+        self.values_by_code = {code: value for value, code in self.codes.items()}
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['codes'] = self.codes
+        return name, path, args, kwargs
+
+    @cached_property
+    def validators(self):
+        # Values are strings; the integer range validators don't apply
+        return [*self.default_validators, *self._validators]
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return None
+        return self.values_by_code.get(value, value)
+
+    def to_python(self, value):
+        if isinstance(value, int) and not isinstance(value, bool):
+            return self.values_by_code.get(value, value)
+        return value
+
+    def get_prep_value(self, value):
+        value = models.Field.get_prep_value(self, value)
+        if value is None or isinstance(value, int):
+            return value
+        try:
+            return self.codes[value]
+        except (KeyError, TypeError) as e:
+            raise ValueError(
+                f"Field '{self.name}' expected one of {sorted(self.codes)}, got {value!r}."
+            ) from e
@@ -0,0 +1,48 @@
+"""
+Django command to normalize and quantize EnhancedEmbedding vectors stored
+before save() did it
+"""
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from embeddings.models import EnhancedEmbedding
+from embeddings.similarity import normalize, quantize
+
+
+class Command(BaseCommand):
+    help = 'Rewrites legacy EnhancedEmbedding vectors as unit length and stores their int8 copies'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of embeddings updated per query',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(options.get('batch_size', 500), 1)
+
+        fields = ['embedding_vector', 'embedding_vector_i8', 'is_normalized']
+        legacy = EnhancedEmbedding.objects.filter(
+            Q(is_normalized=False) | Q(embedding_vector_i8__isnull=True)
+        ).only('pk', *fields)
+
+        updated = 0
+        batch = []
+        for embedding in legacy.iterator(chunk_size=batch_size):
+            vector = normalize(embedding.embedding_vector)
+            embedding.embedding_vector = vector.tolist()
+            embedding.embedding_vector_i8 = quantize(vector).tobytes()
+            embedding.is_normalized = True
+            batch.append(embedding)
+            if len(batch) >= batch_size:
+                EnhancedEmbedding.objects.bulk_update(batch, fields)
+                updated += len(batch)
+                batch = []
+        if batch:
+            EnhancedEmbedding.objects.bulk_update(batch, fields)
+            updated += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"{updated} embedding(s) normalized"))
@@ -0,0 +1,66 @@
+"""
+On-disk vector matrices for knowledge base similarity search
+
+A knowledge base's unit-length vectors are written once as one contiguous
+(N, d) float32 .npy file, with a sidecar of row ids, and memory-mapped by
+every process after that, so all workers share one copy through the page
+cache instead of each decoding the rows from the database.
+"""
+import logging
+import os
+import tempfile
+import uuid
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _stem(kb_id, version):
+    # The version is part of the name, so stale files are never read
+    count, last_update = version
+    stamp = int(last_update.timestamp() * 1_000_000) if last_update else 0
+    return f"{kb_id}-{count}-{stamp}"
+
+
+def _write(path, array):
+    """Write an array next to path and move it into place atomically"""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, array, allow_pickle=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_matrix(kb_id, version):
+    """Memory-map a stored matrix; returns (pks, matrix) or None if missing"""
+    stem = _stem(kb_id, version)
+    directory = settings.EMBEDDING_MATRIX_DIR
+    try:
+        # The matrix is written last, so if it exists the ids do too
+        matrix = np.load(directory / f"{stem}.npy", mmap_mode='r')
+        ids = np.load(directory / f"{stem}.ids.npy")
+    except (FileNotFoundError, ValueError):
+        return None
+    return [uuid.UUID(bytes=row.tobytes()) for row in ids], matrix
+
+
+def save_matrix(kb_id, version, pks, matrix):
+    """Store a matrix and drop older versions; failures only log"""
+    stem = _stem(kb_id, version)
+    directory = settings.EMBEDDING_MATRIX_DIR
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        ids = np.frombuffer(b''.join(pk.bytes for pk in pks), dtype=np.uint8).reshape(-1, 16)
+        _write(directory / f"{stem}.ids.npy", ids)
+        _write(directory / f"{stem}.npy", np.ascontiguousarray(matrix, dtype=np.float32))
+
+        for path in directory.glob(f"{kb_id}-*.npy"):
+            if not path.name.startswith(f"{stem}."):
+                path.unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning(f"Could not store vector matrix for knowledge base {kb_id}: {e}")
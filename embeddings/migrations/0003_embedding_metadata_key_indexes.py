@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-16 14:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('embeddings', '0002_alter_embedding_options_knowledgebase_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='embedding',
+            index=models.Index(models.F('origin'), models.F('metadata__text_id'), name='emb_origin_text_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='embedding',
+            index=models.Index(models.F('metadata__type'), name='emb_meta_type_idx'),
+        ),
+    ]
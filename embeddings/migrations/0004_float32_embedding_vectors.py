@@ -0,0 +1,89 @@
+# Generated by Django 5.2.6 on 2026-10-16 15:02
+
+import core.validators
+import embeddings.fields
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+
+def _convert(apps, source, target):
+    for model_name in ('Embedding', 'EnhancedEmbedding'):
+        model = apps.get_model('embeddings', model_name)
+        batch = []
+        for obj in model.objects.only('pk', source).iterator(chunk_size=BATCH_SIZE):
+            setattr(obj, target, getattr(obj, source))
+            batch.append(obj)
+            if len(batch) >= BATCH_SIZE:
+                model.objects.bulk_update(batch, [target])
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, [target])
+
+
+def json_to_float32(apps, schema_editor):
+    _convert(apps, 'embedding_vector', 'embedding_vector_f32')
+
+
+def float32_to_json(apps, schema_editor):
+    _convert(apps, 'embedding_vector_f32', 'embedding_vector')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('embeddings', '0003_embedding_metadata_key_indexes'),
+    ]
+
+    operations = [
+        # Relax the JSON columns so the reverse migration can re-add them
+        migrations.AlterField(
+            model_name='embedding',
+            name='embedding_vector',
+            field=models.JSONField(null=True, verbose_name='Vetor Embedding'),
+        ),
+        migrations.AlterField(
+            model_name='enhancedembedding',
+            name='embedding_vector',
+            field=models.JSONField(null=True, validators=[core.validators.validate_embedding_vector], verbose_name='Embedding Vector'),
+        ),
+        migrations.AddField(
+            model_name='embedding',
+            name='embedding_vector_f32',
+            field=embeddings.fields.Float32VectorField(editable=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='enhancedembedding',
+            name='embedding_vector_f32',
+            field=embeddings.fields.Float32VectorField(editable=True, null=True),
+        ),
+        migrations.RunPython(json_to_float32, float32_to_json),
+        migrations.RemoveField(
+            model_name='embedding',
+            name='embedding_vector',
+        ),
+        migrations.RemoveField(
+            model_name='enhancedembedding',
+            name='embedding_vector',
+        ),
+        migrations.RenameField(
+            model_name='embedding',
+            old_name='embedding_vector_f32',
+            new_name='embedding_vector',
+        ),
+        migrations.RenameField(
+            model_name='enhancedembedding',
+            old_name='embedding_vector_f32',
+            new_name='embedding_vector',
+        ),
+        migrations.AlterField(
+            model_name='embedding',
+            name='embedding_vector',
+            field=embeddings.fields.Float32VectorField(editable=True, verbose_name='Vetor Embedding'),
+        ),
+        migrations.AlterField(
+            model_name='enhancedembedding',
+            name='embedding_vector',
+            field=embeddings.fields.Float32VectorField(editable=True, validators=[core.validators.validate_embedding_vector], verbose_name='Embedding Vector'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-16 14:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('embeddings', '0004_float32_embedding_vectors'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='embedding',
+            index=models.Index(fields=['origin', '-created_at'], name='embeddings__origin_63ff96_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='embedding',
+            index=models.Index(fields=['-created_at'], name='embeddings__created_5822b5_idx'),
+        ),
+    ]
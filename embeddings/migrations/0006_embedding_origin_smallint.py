@@ -0,0 +1,48 @@
+# Generated by Django 5.2.6 on 2026-10-16 14:48
+
+import embeddings.fields
+from django.db import migrations
+
+# Must match embeddings.models.ORIGIN_CODES
+FORWARD_SQL = """
+ALTER TABLE embeddings_embedding
+    ALTER COLUMN origin TYPE smallint USING CASE origin
+        WHEN 'webscraping' THEN 1
+        WHEN 'generated' THEN 2
+        WHEN 'business_brain' THEN 3
+    END,
+    ADD CONSTRAINT embeddings_embedding_origin_check CHECK (origin >= 0);
+"""
+
+REVERSE_SQL = """
+ALTER TABLE embeddings_embedding
+    DROP CONSTRAINT embeddings_embedding_origin_check,
+    ALTER COLUMN origin TYPE varchar(20) USING CASE origin
+        WHEN 1 THEN 'webscraping'
+        WHEN 2 THEN 'generated'
+        WHEN 3 THEN 'business_brain'
+    END;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('embeddings', '0005_embedding_origin_created_indexes'),
+    ]
+
+    operations = [
+        # The column is rewritten in place; indexes on origin are rebuilt by
+        # Postgres as part of the ALTER
+        migrations.RunSQL(
+            FORWARD_SQL,
+            REVERSE_SQL,
+            state_operations=[
+                migrations.AlterField(
+                    model_name='embedding',
+                    name='origin',
+                    field=embeddings.fields.CodedChoiceField(choices=[('webscraping', 'WebScraping'), ('generated', 'Generated'), ('business_brain', 'Business Brain')], codes={'business_brain': 3, 'generated': 2, 'webscraping': 1}, verbose_name='Origem'),
+                ),
+            ],
+        ),
+    ]
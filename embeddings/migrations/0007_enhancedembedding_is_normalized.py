@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-16 14:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('embeddings', '0006_embedding_origin_smallint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enhancedembedding',
+            name='is_normalized',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Unit-Length Vector'),
+        ),
+    ]
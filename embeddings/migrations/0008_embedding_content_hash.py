@@ -0,0 +1,66 @@
+# Generated by Django 5.2.6 on 2026-10-16 15:20
+
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import migrations, models
+
+BATCH_SIZE = 5000
+WORKERS = min(8, os.cpu_count() or 1)
+
+
+def _digest_all(contents):
+    # Must match embeddings.models.content_digest
+    sha256 = hashlib.sha256
+    return [sha256(content.strip().encode()).hexdigest() for content in contents]
+
+
+def _digest_batch(executor, batch):
+    # hashlib releases the GIL while hashing, so slices of a batch hash in
+    # parallel; queries stay on the migration's connection, which holds
+    # the table lock from AddField
+    step = -(-len(batch) // WORKERS)
+    slices = [
+        [obj.content for obj in batch[start:start + step]]
+        for start in range(0, len(batch), step)
+    ]
+    digests = (digest for part in executor.map(_digest_all, slices) for digest in part)
+    for obj, digest in zip(batch, digests):
+        obj.content_hash = digest
+
+
+def backfill_content_hash(apps, schema_editor):
+    Embedding = apps.get_model('embeddings', 'Embedding')
+    batch = []
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        for obj in Embedding.objects.only('pk', 'content').iterator(chunk_size=BATCH_SIZE):
+            batch.append(obj)
+            if len(batch) >= BATCH_SIZE:
+                _digest_batch(executor, batch)
+                Embedding.objects.bulk_update(batch, ['content_hash'])
+                batch = []
+        if batch:
+            _digest_batch(executor, batch)
+            Embedding.objects.bulk_update(batch, ['content_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('embeddings', '0007_enhancedembedding_is_normalized'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='embedding',
+            name='content_hash',
+            field=models.CharField(default='', editable=False, max_length=64, verbose_name='Hash do Conteúdo'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_content_hash, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='embedding',
+            index=models.Index(fields=['origin', 'content_hash'], name='embeddings__origin_d5283e_idx'),
+        ),
+    ]
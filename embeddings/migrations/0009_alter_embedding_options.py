@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-16 14:59
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('embeddings', '0008_embedding_content_hash'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='embedding',
+            options={'verbose_name': 'Embedding (Deprecated)', 'verbose_name_plural': 'Embeddings (Deprecated)'},
+        ),
+    ]
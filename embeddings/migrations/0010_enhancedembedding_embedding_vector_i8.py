@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-16 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('embeddings', '0009_alter_embedding_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enhancedembedding',
+            name='embedding_vector_i8',
+            field=models.BinaryField(null=True, verbose_name='Quantized Embedding Vector'),
+        ),
+    ]
@@ -1,10 +1,38 @@
+import hashlib
 import uuid
+
+import numpy as np
+from cachetools import LRUCache
 from django.db import models
+from django.db.models import Count, F, Max
+from django.db.models.functions import Cast
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
 from core.models import TimeStampedModel, Campaign
 from core.validators import validate_embedding_vector, validate_metadata_structure
+from .fields import VECTOR_DTYPE, CodedChoiceField, Float32VectorField
+from .matrices import load_matrix, save_matrix
+from .similarity import (
+    as_vector, cosine_similarities, cosine_similarity, int8_similarities, normalize,
+    quantize, top_k_indices, unit_similarities,
+)
+
+# Never renumber: the codes are what the origin column stores
+ORIGIN_CODES = {
+    'webscraping': 1,
+    'generated': 2,
+    'business_brain': 3,
+}
+
+
+def content_digest(content):
+    """SHA-256 of content without surrounding whitespace, as hex"""
+    return hashlib.sha256(content.strip().encode()).hexdigest()
+
+
+# (pks, matrix) per knowledge base and precision, with the version it was built at
+_KB_MATRICES = LRUCache(maxsize=32)
 
 
 class KnowledgeBase(TimeStampedModel):
@@ -76,6 +104,92 @@ class KnowledgeBase(TimeStampedModel):
     def __str__(self):
         return f"{self.name} ({self.owner.username})"
 
+    def _get_vector_matrix(self, quantized=False):
+        """
+        Stacked vectors of this knowledge base, cached per process
+
+        Unit-length float32 rows, memory-mapped from the file shared by all
+        processes, or the stored int8 rows when quantized.
+        """
+        # Count catches deletes; updated_at (auto_now) catches adds and edits
+        version = tuple(self.embeddings.aggregate(
+            count=Count('pk'), last_update=Max('updated_at')
+        ).values())
+        cached = _KB_MATRICES.get((self.pk, quantized))
+        if cached is not None and cached[0] == version:
+            return cached[1], cached[2]
+
+        if quantized:
+            pks, matrix = self._read_int8_matrix()
+        else:
+            stored = load_matrix(self.pk, version)
+            if stored is not None:
+                pks, matrix = stored
+            else:
+                pks, matrix = self._read_float32_matrix()
+                if pks:
+                    save_matrix(self.pk, version, pks, matrix)
+        _KB_MATRICES[(self.pk, quantized)] = (version, pks, matrix)
+        return pks, matrix
+
+    def _read_float32_matrix(self):
+        # Read the packed float32 bytes as they are, skipping the list
+        # conversion Float32VectorField does for regular model access
+        rows = list(self.embeddings.order_by().values_list(
+            'pk', Cast('embedding_vector', output_field=models.BinaryField())
+        ))
+        pks = [pk for pk, _ in rows]
+        if not rows:
+            return pks, np.empty((0, self.dimension), dtype=np.float32)
+
+        matrix = np.stack([np.frombuffer(data, dtype=VECTOR_DTYPE) for _, data in rows])
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-12
+        return pks, matrix
+
+    def _read_int8_matrix(self):
+        rows = list(self.embeddings.order_by().values_list('pk', 'embedding_vector_i8'))
+        pks = [pk for pk, _ in rows]
+        if not rows:
+            return pks, np.empty((0, self.dimension), dtype=np.int8)
+
+        # Rows not yet backfilled by normalize_embeddings are quantized here
+        missing = [pk for pk, data in rows if data is None]
+        if missing:
+            vectors = dict(self.embeddings.filter(pk__in=missing).values_list(
+                'pk', 'embedding_vector'
+            ))
+            rows = [
+                (pk, quantize(vectors[pk]) if data is None else data)
+                for pk, data in rows
+            ]
+        matrix = np.stack([np.frombuffer(data, dtype=np.int8) for _, data in rows])
+        return pks, matrix
+
+    def similarity_search(self, query_vector, top_k=10, quantized=False):
+        """
+        Find the embeddings most similar to a query vector
+
+        Scores every embedding in one matrix-vector product and sorts only
+        the top_k. With quantized=True the int8 copies are scored instead:
+        a quarter of the memory and bandwidth, for slightly less precise
+        scores. Returns (embedding, similarity) pairs, best first.
+        """
+        pks, matrix = self._get_vector_matrix(quantized)
+        if not pks or top_k <= 0:
+            return []
+
+        if quantized:
+            scores = int8_similarities(query_vector, matrix)
+        else:
+            scores = unit_similarities(query_vector, matrix)
+        top = top_k_indices(scores, top_k)
+
+        embeddings = self.embeddings.in_bulk([pks[i] for i in top])
+        return [
+            (embeddings[pks[i]], float(scores[i]))
+            for i in top if pks[i] in embeddings
+        ]
+
 
 class EnhancedEmbedding(TimeStampedModel):
     """Enhanced embedding model with better relationships and metadata"""
@@ -102,10 +216,15 @@ class EnhancedEmbedding(TimeStampedModel):
     )
 
     # Embedding Data
-    embedding_vector = models.JSONField(
+    embedding_vector = Float32VectorField(
         validators=[validate_embedding_vector],
         verbose_name="Embedding Vector"
     )
+    # int8 copy of the vector for quantized similarity search
+    embedding_vector_i8 = models.BinaryField(
+        null=True,
+        verbose_name="Quantized Embedding Vector"
+    )
     model_name = models.CharField(
         max_length=100,
         default='text-embedding-ada-002',
@@ -197,6 +316,14 @@ class EnhancedEmbedding(TimeStampedModel):
         verbose_name="Enhanced Metadata"
     )
 
+    # False for rows written before vectors were normalized on save;
+    # backfilled by the normalize_embeddings command
+    is_normalized = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name="Unit-Length Vector"
+    )
+
     # Usage Statistics
     similarity_search_count = models.PositiveIntegerField(
         default=0,
@@ -223,14 +350,57 @@ class EnhancedEmbedding(TimeStampedModel):
     def __str__(self):
         return f"{self.title[:50]}... ({self.knowledge_base.name})"
 
+    def save(self, *args, **kwargs):
+        # Store unit-length vectors so similarity only needs a dot product
+        update_fields = kwargs.get('update_fields')
+        if self.embedding_vector is not None and (
+            update_fields is None or 'embedding_vector' in update_fields
+        ):
+            vector = normalize(self.embedding_vector)
+            self.embedding_vector = vector.tolist()
+            self.embedding_vector_i8 = quantize(vector).tobytes()
+            self.is_normalized = True
+            if update_fields is not None:
+                kwargs['update_fields'] = {
+                    *update_fields, 'embedding_vector_i8', 'is_normalized'
+                }
+        super().save(*args, **kwargs)
+
+    @property
+    def _vector(self):
+        """embedding_vector as a float32 array, decoded once per value"""
+        value = self.embedding_vector
+        cached = self.__dict__.get('_vector_cache')
+        # Keyed on the list itself, so assigning a new vector invalidates it
+        if cached is None or cached[0] is not value:
+            cached = self.__dict__['_vector_cache'] = (value, as_vector(value))
+        return cached[1]
+
     def calculate_similarity(self, other_vector):
         """Calculate cosine similarity with another vector"""
-        import numpy as np
+        if self.is_normalized:
+            return float(np.dot(self._vector, normalize(other_vector)))
+        return cosine_similarity(self._vector, other_vector)
+
+    @staticmethod
+    def rank_by_similarity(query_vector, queryset, limit=None):
+        """
+        Rank embeddings by cosine similarity to a query vector
 
-        a = np.array(self.embedding_vector)
-        b = np.array(other_vector)
+        All vectors are stacked into one float32 matrix and compared in a
+        single call. Returns (embedding, similarity) pairs, best first.
+        """
+        embeddings = list(queryset)
+        if not embeddings:
+            return []
 
-        return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
+        vectors = np.stack([embedding._vector for embedding in embeddings])
+        if all(embedding.is_normalized for embedding in embeddings):
+            similarities = unit_similarities(query_vector, vectors)
+        else:
+            similarities = cosine_similarities(query_vector, vectors)
+        order = top_k_indices(similarities, limit)
+        return [(embeddings[i], float(similarities[i])) for i in order]
 
 
 # Keep original Embedding model for backward compatibility (deprecated)
@@ -241,13 +411,14 @@ class Embedding(models.Model):
         default=uuid.uuid4,
         editable=False
     )
-    origin = models.CharField(
-        max_length=20,
+    # Stored as a smallint code; read and filtered by the string values
+    origin = CodedChoiceField(
         choices=[
             ('webscraping', 'WebScraping'),
             ('generated', 'Generated'),
             ('business_brain', 'Business Brain')
         ],
+        codes=ORIGIN_CODES,
         null=False,
         blank=False,
         verbose_name="Origem"
@@ -257,13 +428,19 @@ class Embedding(models.Model):
         blank=False,
         null=False
     )
+    # Kept in sync by save(); duplicates are found by grouping on it
+    content_hash = models.CharField(
+        max_length=64,
+        editable=False,
+        verbose_name="Hash do Conteúdo"
+    )
     title = models.CharField(
         max_length=500,
         verbose_name="Título",
         blank=True,
         null=True
     )
-    embedding_vector = models.JSONField(
+    embedding_vector = Float32VectorField(
         verbose_name="Vetor Embedding",
         null=False,
         blank=False
@@ -283,9 +460,33 @@ class Embedding(models.Model):
     )
 
     class Meta:
-        ordering = ['-id']
+        # No default ordering: sorting on a random UUID meant nothing and
+        # every listing orders by created_at explicitly
         verbose_name = "Embedding (Deprecated)"
         verbose_name_plural = "Embeddings (Deprecated)"
+        indexes = [
+            # Single-key equality (metadata__text_id=..., metadata__type=...)
+            # compiles to metadata -> 'key', which GIN can't serve; btree
+            # expression indexes on the extracted keys can
+            models.Index(
+                F('origin'), F('metadata__text_id'),
+                name='emb_origin_text_id_idx'
+            ),
+            models.Index(F('metadata__type'), name='emb_meta_type_idx'),
+            # Admin changelist: filter on origin, ordered by newest
+            models.Index(fields=['origin', '-created_at']),
+            models.Index(fields=['-created_at']),
+            # Duplicate detection groups by content hash within an origin
+            models.Index(fields=['origin', 'content_hash']),
+        ]
 
     def __str__(self) -> str:
         return f"{self.origin}: {self.title or 'Sem título'}"
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'content' in update_fields:
+            self.content_hash = content_digest(self.content)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'content_hash'}
+        super().save(*args, **kwargs)
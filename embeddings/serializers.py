@@ -1,11 +1,12 @@
 from rest_framework import serializers
 from .models import KnowledgeBase, EnhancedEmbedding, Embedding
-from core.serializers import BaseEnhancedSerializer, UserSerializer
+from core.serializers import BaseEnhancedSerializer, NestedUserField
 from core.validators import validate_embedding_vector, validate_metadata_structure
+from .similarity import as_vector
 
 
 class KnowledgeBaseSerializer(BaseEnhancedSerializer):
-    owner = UserSerializer(read_only=True)
+    owner = NestedUserField()
 
     class Meta:
         model = KnowledgeBase
@@ -28,6 +29,8 @@ class KnowledgeBaseSerializer(BaseEnhancedSerializer):
 
 class EnhancedEmbeddingSerializer(BaseEnhancedSerializer):
     knowledge_base = KnowledgeBaseSerializer(read_only=True)
+    # Stored as packed float32; exposed as a JSON list of numbers
+    embedding_vector = serializers.JSONField()
 
     class Meta:
         model = EnhancedEmbedding
@@ -46,7 +49,9 @@ class EnhancedEmbeddingSerializer(BaseEnhancedSerializer):
 
     def validate_embedding_vector(self, value):
         validate_embedding_vector(value)
-        return value
+        # Passed on as float32 so EnhancedEmbedding.save() normalizes it
+        # without converting the list again
+        return as_vector(value)
 
     def validate_metadata(self, value):
         validate_metadata_structure(value)
@@ -54,6 +59,9 @@ class EnhancedEmbeddingSerializer(BaseEnhancedSerializer):
 
 
 class EmbeddingSerializer(serializers.ModelSerializer):
+    # Stored as packed float32; exposed as a JSON list of numbers
+    embedding_vector = serializers.JSONField()
+
     class Meta:
         model = Embedding
         fields = [
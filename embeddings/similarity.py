@@ -0,0 +1,97 @@
+"""
+Cosine similarity between embedding vectors
+
+Uses SimSIMD's SIMD kernels when the optional ``simsimd`` package is
+installed and falls back to NumPy otherwise.
+"""
+import numpy as np
+
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+
+def as_vector(value):
+    """Get a contiguous float32 array for a vector, without copying if possible"""
+    return np.ascontiguousarray(value, dtype=np.float32)
+
+
+def normalize(vector):
+    """Scale a vector to unit length; zero vectors are left as they are"""
+    vector = as_vector(vector)
+    return vector / (np.sqrt(np.vdot(vector, vector)) + 1e-12)
+
+
+def quantize(vector):
+    """Quantize a vector to int8, scaled so its largest component is 127"""
+    vector = as_vector(vector)
+    peak = np.abs(vector).max() if vector.size else 0
+    if not peak:
+        return np.zeros(vector.shape, dtype=np.int8)
+    return np.round(vector * (127 / peak)).astype(np.int8)
+
+
+def cosine_similarity(a, b):
+    """Cosine similarity between two vectors"""
+    a = as_vector(a)
+    b = as_vector(b)
+    if simsimd is not None:
+        return 1.0 - float(simsimd.cosine(a, b))
+    # One sqrt of the product of squared norms instead of two norm() calls
+    return float(np.dot(a, b) / np.sqrt(np.vdot(a, a) * np.vdot(b, b)))
+
+
+def cosine_similarities(query, matrix):
+    """Cosine similarity between a query vector and each row of a matrix"""
+    query = as_vector(query)
+    matrix = as_vector(matrix)
+    if len(matrix) == 0:
+        return np.empty(0, dtype=np.float32)
+    if simsimd is not None:
+        distances = np.asarray(simsimd.cdist(query[None, :], matrix, metric='cosine'))
+        return 1.0 - distances[0]
+    squared_norms = np.einsum('ij,ij->i', matrix, matrix)
+    return (matrix @ query) / np.sqrt(squared_norms * np.vdot(query, query))
+
+
+def unit_similarities(query, matrix):
+    """
+    Cosine similarity between a query vector and rows that are unit length
+
+    Only the query is normalized, so each score is a single dot product.
+    """
+    matrix = as_vector(matrix)
+    if len(matrix) == 0:
+        return np.empty(0, dtype=np.float32)
+    return matrix @ normalize(query)
+
+
+def int8_similarities(query, matrix):
+    """
+    Cosine similarity between a query vector and int8-quantized rows
+
+    Cosine ignores each vector's scale, so rows need no dequantizing.
+    """
+    query = quantize(query)
+    if len(matrix) == 0:
+        return np.empty(0, dtype=np.float32)
+    if simsimd is not None:
+        distances = np.asarray(simsimd.cdist(query[None, :], matrix, metric='cosine'))
+        return 1.0 - distances[0]
+    return cosine_similarities(query, matrix)
+
+
+def top_k_indices(scores, k=None):
+    """
+    Indices of the k highest scores, best first
+
+    Selects with argpartition and sorts only the selected k, instead of
+    sorting every score. k=None returns all indices in order.
+    """
+    if k is None or k >= len(scores):
+        return np.argsort(-scores)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    top = np.argpartition(-scores, k)[:k]
+    return top[np.argsort(-scores[top])]
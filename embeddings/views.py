@@ -1,11 +1,18 @@
+import numpy as np
 from rest_framework import generics, filters
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.response import Response
+from django.db.models import BinaryField, Q
+from django.db.models.functions import Cast
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
+from core.renderers import dumps
+from embeddings.fields import VECTOR_DTYPE
 from embeddings.models import Embedding
 from embeddings.serializers import EmbeddingSerializer
 from app.permissions import GlobalDefaultPermission
 
+STREAM_CHUNK_SIZE = 500
+
 
 class EmbeddingCreateListView(generics.ListCreateAPIView):
     permission_classes = (IsAuthenticated, GlobalDefaultPermission)
@@ -22,7 +29,6 @@ class EmbeddingCreateListView(generics.ListCreateAPIView):
         search_query = self.request.query_params.get('q', None)
         if search_query:
             # Busca em múltiplos campos do metadata usando Q objects
-            from django.db.models import Q
             queryset = queryset.filter(
                 Q(metadata__elasticsearch_index__icontains=search_query
                   ) |
@@ -40,12 +46,29 @@ class EmbeddingCreateListView(generics.ListCreateAPIView):
         """
         queryset = self.filter_queryset(self.get_queryset())
 
-        # Extrair metadados e vetores separadamente
-        metadados = []
-        vetores = []
+        # Transmitido em partes: nunca mantém todos os vetores em memória
+        return StreamingHttpResponse(
+            self.stream_embeddings(queryset),
+            content_type='application/json'
+        )
+
+    def stream_embeddings(self, queryset):
+        """
+        Gera o JSON {"metadados": [...], "vetores": [...], "total": N}
+
+        Os metadados vêm numa primeira passada sem os vetores; os vetores
+        são buscados depois, em lotes pelos ids já enviados, para manter
+        as duas listas alinhadas.
+        """
+        ids = []
 
-        for embedding in queryset:
-            metadados.append({
+        yield b'{"metadados":['
+        rows = queryset.defer('embedding_vector').iterator(chunk_size=STREAM_CHUNK_SIZE)
+        for embedding in rows:
+            if ids:
+                yield b','
+            ids.append(embedding.id)
+            yield dumps({
                 'id': str(embedding.id),
                 'origin': embedding.origin,
                 'title': embedding.title,
@@ -54,13 +77,27 @@ class EmbeddingCreateListView(generics.ListCreateAPIView):
                 'created_at': embedding.created_at,
                 'updated_at': embedding.updated_at
             })
-            vetores.append(embedding.embedding_vector)
 
-        return Response({
-            'metadados': metadados,
-            'vetores': vetores,
-            'total': len(metadados)
-        })
+        yield b'],"vetores":['
+        for start in range(0, len(ids), STREAM_CHUNK_SIZE):
+            chunk = ids[start:start + STREAM_CHUNK_SIZE]
+            # Bytes float32 brutos, sem a conversão para lista do campo
+            vectors = dict(Embedding.objects.filter(pk__in=chunk).values_list(
+                'pk', Cast('embedding_vector', output_field=BinaryField())
+            ))
+            parts = []
+            for pk in chunk:
+                data = vectors.get(pk)
+                # Removido entre as passadas: null mantém o alinhamento
+                parts.append(
+                    b'null' if data is None
+                    else dumps(np.frombuffer(data, dtype=VECTOR_DTYPE))
+                )
+            if start:
+                yield b','
+            yield b','.join(parts)
+
+        yield b'],"total":%d}' % len(ids)
 
 
 class EmbeddingRetrieveUpdateDestroyView(
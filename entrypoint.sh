@@ -43,6 +43,7 @@ EOF
 
 python manage.py makemigrations
 python manage.py migrate
+python manage.py create_audit_partitions
 python manage.py collectstatic --noinput
 python manage.py setup_superuser
 python manage.py create_members_group
@@ -63,4 +64,16 @@ ASYNC_BOT_PID=$!
 echo "Async Bot iniciado com PID: $ASYNC_BOT_PID"
 echo "Logs do async bot: /app/unipost_automation/logs/async_bot.log"
 
+echo "Iniciando atualização horária das métricas da API em background..."
+mkdir -p logs
+(
+  while true; do
+    python manage.py refresh_system_metrics || true
+    sleep 3600
+  done
+) > logs/refresh_system_metrics.log 2>&1 &
+METRICS_PID=$!
+echo "Atualização de métricas iniciada com PID: $METRICS_PID"
+echo "Logs das métricas: /app/logs/refresh_system_metrics.log"
+
 gunicorn --bind 0.0.0.0:8005 --workers 4 --timeout 120 app.wsgi:application
@@ -7,10 +7,11 @@ baseado no campo content
 import os
 import sys
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 from datetime import datetime
+from itertools import groupby
+from operator import attrgetter
 from pathlib import Path
-from collections import defaultdict
 
 import django
 
@@ -22,6 +23,9 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
 django.setup()
 
 # Django imports after setup
+from django.db import connection
+from django.db.models import Count, Func, QuerySet
+from django.db.models.functions import Left
 from embeddings.models import Embedding
 
 # Configuração de logging
@@ -35,6 +39,31 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+CONTENT_PREVIEW_LENGTH = 100
+
+
+# Mantém o embedding mais antigo de cada content_hash e remove o resto,
+# devolvendo cada id removido com o id mantido no seu grupo
+DELETE_DUPLICATES_SQL = """
+    WITH keep AS (
+        SELECT DISTINCT ON (content_hash) id, content_hash
+        FROM embeddings_embedding
+        WHERE origin = %(origin)s
+        ORDER BY content_hash, created_at, id
+    )
+    DELETE FROM embeddings_embedding e
+    USING keep k
+    WHERE e.origin = %(origin)s
+        AND e.content_hash = k.content_hash
+        AND e.id <> k.id
+    RETURNING e.id, k.id
+"""
+
+
+class StripWhitespace(Func):
+    """Remove espaços em branco das pontas, como str.strip()"""
+    template = "REGEXP_REPLACE(%(expressions)s, '^\\s+|\\s+$', '', 'g')"
+
 
 class DuplicateRemover:
     """Classe para remover embeddings duplicados de origem webscraping"""
@@ -42,86 +71,75 @@ class DuplicateRemover:
     def __init__(self):
         self.processed_count = 0
         self.duplicates_removed = 0
-        self.content_groups = defaultdict(list)
 
-    def get_webscraping_embeddings(self) -> List[Embedding]:
-        """Obtém todos os embeddings de origem webscraping"""
-        try:
-            embeddings = Embedding.objects.filter(
-                origin='webscraping'
-            ).order_by('created_at')
-            logger.info(
-                f"Encontrados {embeddings.count()} embeddings de "
-                f"webscraping"
-            )
-            return list(embeddings)
-        except Exception as e:
-            logger.error(f"Erro ao consultar embeddings: {e}")
-            return []
-
-    def group_by_content(
-            self, embeddings: List[Embedding]
-    ) -> Dict[str, List[Embedding]]:
-        """Agrupa embeddings pelo conteúdo"""
-        content_groups = defaultdict(list)
-
-        for embedding in embeddings:
-            content_key = embedding.content.strip()
-            content_groups[content_key].append(embedding)
-
-        logger.info(
-            f"Agrupados em {len(content_groups)} grupos de conteúdo "
-            f"único"
-        )
-        return content_groups
+    def get_webscraping_embeddings(self) -> QuerySet:
+        """Consulta os embeddings de origem webscraping"""
+        return Embedding.objects.filter(origin='webscraping')
 
     def find_duplicates(
-            self, embeddings: List[Embedding]
-    ) -> Dict[str, List[Embedding]]:
-        """Identifica grupos de embeddings com conteúdo duplicado"""
-        content_groups = self.group_by_content(embeddings)
-
-        duplicates = {}
-        for content, group in content_groups.items():
-            if len(group) > 1:
-                duplicates[content] = group
+            self, embeddings: QuerySet
+    ) -> Iterator[List[Embedding]]:
+        """
+        Gera os grupos de embeddings com conteúdo duplicado
+
+        O agrupamento pelo content_hash indexado é feito no banco; apenas
+        os embeddings dos grupos com duplicatas são lidos, sem conteúdo
+        nem vetor, em lotes e ordenados por hash, de modo que cada grupo
+        é uma sequência contígua e só um grupo fica em memória por vez.
+        """
+        duplicate_hashes = embeddings.values('content_hash').annotate(
+            total=Count('id')
+        ).filter(total__gt=1).values('content_hash')
+
+        rows = embeddings.filter(
+            content_hash__in=duplicate_hashes
+        ).annotate(
+            content_preview=Left(
+                StripWhitespace('content'), CONTENT_PREVIEW_LENGTH + 1
+            )
+        ).only('id', 'content_hash', 'title', 'created_at').order_by(
+            'content_hash', 'created_at'
+        ).iterator(chunk_size=5000)
 
-        logger.info(f"Encontrados {len(duplicates)} grupos com duplicatas")
-        return duplicates
+        for _, group in groupby(rows, key=attrgetter('content_hash')):
+            yield list(group)
 
     def select_embedding_to_keep(
             self, duplicates: List[Embedding]
     ) -> Embedding:
         """Seleciona qual embedding manter entre as duplicatas"""
-        # Ordena por data de criação (mantém o mais antigo)
-        sorted_embeddings = sorted(duplicates, key=lambda x: x.created_at)
-        return sorted_embeddings[0]
+        # Mantém o mais antigo
+        return min(duplicates, key=attrgetter('created_at'))
 
     def remove_duplicates_dry_run(
-            self, embeddings: List[Embedding]
+            self, embeddings: QuerySet, total: int = None
     ) -> Dict[str, Any]:
         """Executa uma simulação da remoção de duplicatas"""
-        duplicates = self.find_duplicates(embeddings)
-
         stats = {
-            'total_embeddings': len(embeddings),
-            'duplicate_groups': len(duplicates),
+            'total_embeddings': (
+                embeddings.count() if total is None else total
+            ),
+            'duplicate_groups': 0,
             'embeddings_to_remove': 0,
-            'embeddings_to_keep': len(duplicates),
+            'embeddings_to_keep': 0,
             'details': []
         }
 
-        for content, duplicate_group in duplicates.items():
+        for duplicate_group in self.find_duplicates(embeddings):
             to_keep = self.select_embedding_to_keep(duplicate_group)
             to_remove = [
                 emb for emb in duplicate_group if emb.id != to_keep.id
             ]
 
+            stats['duplicate_groups'] += 1
+            stats['embeddings_to_keep'] += 1
             stats['embeddings_to_remove'] += len(to_remove)
 
+            content = to_keep.content_preview
             group_info = {
                 'content_preview': (
-                    content[:100] + '...' if len(content) > 100
+                    content[:CONTENT_PREVIEW_LENGTH] + '...'
+                    if len(content) > CONTENT_PREVIEW_LENGTH
                     else content
                 ),
                 'total_duplicates': len(duplicate_group),
@@ -141,56 +159,58 @@ class DuplicateRemover:
             }
             stats['details'].append(group_info)
 
+        logger.info(
+            f"Encontrados {stats['duplicate_groups']} grupos com duplicatas"
+        )
         return stats
 
     def remove_duplicates(
-            self, embeddings: List[Embedding], confirm: bool = False
+            self, embeddings: QuerySet, confirm: bool = False,
+            total: int = None
     ) -> Dict[str, Any]:
         """Remove embeddings duplicados"""
         if not confirm:
             logger.warning(
                 "Executando dry run - nenhuma exclusão será realizada"
             )
-            return self.remove_duplicates_dry_run(embeddings)
+            return self.remove_duplicates_dry_run(embeddings, total)
 
-        duplicates = self.find_duplicates(embeddings)
         removed_ids = []
         kept_ids = []
 
-        for content, duplicate_group in duplicates.items():
-            to_keep = self.select_embedding_to_keep(duplicate_group)
-            to_remove = [
-                emb for emb in duplicate_group if emb.id != to_keep.id
-            ]
-
-            kept_ids.append(str(to_keep.id))
-
-            # Remove duplicatas
-            for embedding in to_remove:
-                try:
-                    embedding_id = str(embedding.id)
-                    embedding.delete()
-                    removed_ids.append(embedding_id)
-                    self.duplicates_removed += 1
-                    logger.info(
-                        f"Removido embedding duplicado: {embedding_id}"
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Erro ao remover embedding {embedding.id}: {e}"
-                    )
+        # Um único DELETE: o Postgres escolhe o mais antigo de cada hash
+        # com DISTINCT ON e remove os demais
+        deleted = 0
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(DELETE_DUPLICATES_SQL, {
+                    'origin': Embedding._meta.get_field(
+                        'origin'
+                    ).get_prep_value('webscraping')
+                })
+                rows = cursor.fetchall()
+            removed_ids = [str(removed_id) for removed_id, _ in rows]
+            kept_ids = list(dict.fromkeys(str(kept_id) for _, kept_id in rows))
+            deleted = len(removed_ids)
+            self.duplicates_removed += deleted
+            logger.info(f"Encontrados {len(kept_ids)} grupos com duplicatas")
+            logger.debug(f"Removidos embeddings duplicados: {removed_ids}")
+        except Exception as e:
+            logger.error(f"Erro ao remover embeddings duplicados: {e}")
 
         stats = {
-            'total_embeddings': len(embeddings),
-            'duplicate_groups': len(duplicates),
-            'embeddings_removed': len(removed_ids),
+            'total_embeddings': (
+                embeddings.count() if total is None else total
+            ),
+            'duplicate_groups': len(kept_ids),
+            'embeddings_removed': deleted,
             'embeddings_kept': len(kept_ids),
             'removed_ids': removed_ids,
             'kept_ids': kept_ids
         }
 
         logger.info(
-            f"Remoção concluída: {len(removed_ids)} embeddings removidos"
+            f"Remoção concluída: {deleted} embeddings removidos"
         )
         return stats
 
@@ -273,13 +293,17 @@ class DuplicateRemover:
         try:
             # Obtém embeddings de webscraping
             embeddings = self.get_webscraping_embeddings()
+            total = embeddings.count()
 
-            if not embeddings:
+            if not total:
                 logger.info("Nenhum embedding de webscraping encontrado")
                 return
+            logger.info(f"Encontrados {total} embeddings de webscraping")
 
             # Remove duplicatas
-            stats = self.remove_duplicates(embeddings, confirm=confirm_removal)
+            stats = self.remove_duplicates(
+                embeddings, confirm=confirm_removal, total=total
+            )
 
             # Salva relatório
             self.save_report(stats)
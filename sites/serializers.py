@@ -1,12 +1,12 @@
 from rest_framework import serializers
 from .models import ScrapedPost, Site
-from core.serializers import BaseEnhancedSerializer, UserSerializer, SourceSiteSerializer
+from core.serializers import BaseEnhancedSerializer, NestedUserField, SourceSiteSerializer
 from core.validators import validate_content_length, validate_url_list
 
 
 class ScrapedPostSerializer(BaseEnhancedSerializer):
     source_site = SourceSiteSerializer(read_only=True)
-    processed_by = UserSerializer(read_only=True)
+    processed_by = NestedUserField()
 
     class Meta:
         model = ScrapedPost
@@ -1,4 +1,4 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth.models import Group, Permission
 from django.contrib.contenttypes.models import ContentType
 from texts.models import Text
@@ -23,41 +23,28 @@ class Command(BaseCommand):
             self.stdout.write(
                 self.style.WARNING("Grupo 'members' já existe.")
             )
-        # Obter ContentTypes dos modelos
-        text_content_type = ContentType.objects.get_for_model(Text)
-        embedding_content_type = ContentType.objects.get_for_model(Embedding)
-        site_content_type = ContentType.objects.get_for_model(Site)
+        # Obter ContentTypes dos modelos (uma única consulta)
+        content_types = ContentType.objects.get_for_models(Text, Site, Embedding)
         # Definir permissões necessárias (add, change, view)
-        permissions_to_add = [
-            # Permissões para Text
-            Permission.objects.get(
-                content_type=text_content_type, codename='add_text'),
-            Permission.objects.get(
-                content_type=text_content_type, codename='change_text'),
-            Permission.objects.get(
-                content_type=text_content_type, codename='view_text'),
-
-            # Permissões para Sites
-            Permission.objects.get(
-                content_type=site_content_type, codename='add_site'),
-            Permission.objects.get(
-                content_type=site_content_type, codename='change_site'),
-            Permission.objects.get(
-                content_type=site_content_type, codename='view_site'),
-
-            # Permissões para Embedding
-            Permission.objects.get(
-                content_type=embedding_content_type, codename='add_embedding'),
-            Permission.objects.get(
-                content_type=embedding_content_type,
-                codename='change_embedding'),
-            Permission.objects.get(
-                content_type=embedding_content_type,
-                codename='view_embedding'),
+        codenames = [
+            f'{action}_{model._meta.model_name}'
+            for model in (Text, Site, Embedding)
+            for action in ('add', 'change', 'view')
         ]
-        # Adicionar permissões ao grupo
+        permissions_to_add = list(
+            Permission.objects.filter(
+                content_type__in=content_types.values(),
+                codename__in=codenames
+            ).order_by('content_type', 'codename')
+        )
+        missing = set(codenames) - {p.codename for p in permissions_to_add}
+        if missing:
+            raise CommandError(
+                f"Permissões não encontradas: {', '.join(sorted(missing))}"
+            )
+        # Adicionar permissões ao grupo (um único INSERT)
+        group.permissions.add(*permissions_to_add)
         for permission in permissions_to_add:
-            group.permissions.add(permission)
             self.stdout.write(
                 f"Permissão '{permission.name}' adicionada ao grupo 'members'"
             )
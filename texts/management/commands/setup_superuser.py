@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 import os
 
 
@@ -55,12 +56,18 @@ class Command(BaseCommand):
             )
             return
 
-        if not User.objects.filter(username=username).exists():
-            User.objects.create_superuser(
-                username=username,
-                email=email or '',
-                password=password
-            )
+        # Um único SELECT quando o usuário já existe; INSERT sem corrida
+        # quando não existe (senha já com hash, sem UPDATE posterior)
+        _, created = User.objects.get_or_create(
+            username=username,
+            defaults={
+                'email': User.objects.normalize_email(email or ''),
+                'password': make_password(password),
+                'is_staff': True,
+                'is_superuser': True,
+            }
+        )
+        if created:
             self.stdout.write(
                 self.style.SUCCESS(
                     f"Superusuário '{username}' criado com sucesso!")
@@ -1,12 +1,12 @@
 from rest_framework import serializers
 from .models import ContentPiece, Text
-from core.serializers import BaseEnhancedSerializer, UserSerializer
+from core.serializers import BaseEnhancedSerializer, NestedUserField
 from core.validators import validate_content_length, validate_tags_list
 from core.models import Campaign
 
 
 class ContentPieceSerializer(BaseEnhancedSerializer):
-    creator = UserSerializer(read_only=True)
+    creator = NestedUserField()
     campaign = serializers.PrimaryKeyRelatedField(
         queryset=Campaign.objects.all(),
         allow_null=True,
@@ -1,11 +1,11 @@
 from rest_framework import serializers
 from .models import AIImageRequest, EnhancedGeneratedImage, GeneratedImage
-from core.serializers import BaseEnhancedSerializer, UserSerializer, CampaignSerializer
+from core.serializers import BaseEnhancedSerializer, NestedUserField, CampaignSerializer
 from core.validators import validate_prompt_content, validate_metadata_structure
 
 
 class AIImageRequestSerializer(BaseEnhancedSerializer):
-    requester = UserSerializer(read_only=True)
+    requester = NestedUserField()
     campaign = CampaignSerializer(read_only=True)
 
     class Meta: